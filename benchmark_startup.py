@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Startup Time Benchmark
+Measures module import time of the entry points with `python -X importtime`
+and checks that fast paths do not load heavy dependencies.
+
+Each scenario runs in a fresh interpreter. The benchmark fails (exit 1) if a
+scenario crashes, imports a module it must not (e.g. AutoGen just to print
+usage) or, with --max-ms, if a CLI scenario's import time exceeds the budget.
+
+Usage:
+    python benchmark_startup.py
+    python benchmark_startup.py --runs 5 --top 10 --max-ms 150
+    python benchmark_startup.py --allow-missing-deps   (skip scenarios whose
+                                                        packages are not installed)
+"""
+import os
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent
+
+# Dependencies only the full question/ingestion paths may load
+HEAVY_MODULES = (
+    "autogen_agentchat", "autogen_core", "autogen_ext", "openai",
+    "pymongo", "motor", "PyPDF2", "numpy", "dotenv", "config.settings",
+)
+
+
+class Scenario(NamedTuple):
+    name: str
+    args: List[str]             # Arguments after `python -X importtime`
+    forbidden: Tuple[str, ...]  # Top-level modules that must not be imported
+    budgeted: bool              # Subject to --max-ms
+
+
+SCENARIOS = [
+    Scenario("main.py (usage)", ["main.py"], HEAVY_MODULES, True),
+    Scenario("interactive.py --help", ["interactive.py", "--help"], HEAVY_MODULES, True),
+    Scenario(
+        "query stack (src.bootstrap)",
+        ["-c", "import src.bootstrap"],
+        ("PyPDF2", "motor", "numpy"),
+        False
+    ),
+]
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark entry point import time.")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per scenario (best is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest modules to list per scenario")
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="Fail if a CLI scenario's import time exceeds this many milliseconds"
+    )
+    parser.add_argument(
+        "--allow-missing-deps",
+        action="store_true",
+        help="Skip scenarios that crash with ModuleNotFoundError instead of failing"
+    )
+    return parser.parse_args()
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse `-X importtime` output.
+    
+    Returns:
+        {module: (self microseconds, cumulative microseconds)}
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        modules[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return modules
+
+
+def run_scenario(scenario: Scenario) -> Tuple[Optional[Dict[str, Tuple[int, int]]], str]:
+    """
+    Run a scenario once.
+    
+    Returns:
+        (parsed import times, "") or, if it crashed, (None, last traceback line)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *scenario.args],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if "Traceback" in result.stderr:
+        return None, result.stderr.strip().splitlines()[-1]
+    return parse_importtime(result.stderr), ""
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    failures = []
+    
+    print("\n" + "="*70)
+    print("⏱️  STARTUP IMPORT TIME BENCHMARK")
+    print("="*70 + "\n")
+    
+    for scenario in SCENARIOS:
+        best = None
+        for _ in range(max(1, args.runs)):
+            modules, error = run_scenario(scenario)
+            if modules is None:
+                break
+            total = sum(self_us for self_us, _ in modules.values())
+            if best is None or total < best[0]:
+                best = (total, modules)
+        
+        if best is None:
+            if args.allow_missing_deps and error.startswith("ModuleNotFoundError"):
+                print(f"• {scenario.name}: skipped ({error})\n")
+            else:
+                print(f"• {scenario.name}: crashed ({error})\n")
+                failures.append(f"{scenario.name} crashed: {error}")
+            continue
+        
+        total, modules = best
+        print(f"• {scenario.name}: {total / 1000:.1f} ms, {len(modules)} modules")
+        slowest = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (_, cumulative) in slowest[:args.top]:
+            print(f"     {cumulative / 1000:8.1f} ms  {name}")
+        
+        loaded = sorted(
+            name for name in scenario.forbidden
+            if name in modules
+        )
+        if loaded:
+            failures.append(f"{scenario.name} imports {', '.join(loaded)}")
+        if scenario.budgeted and args.max_ms is not None and total / 1000 > args.max_ms:
+            failures.append(f"{scenario.name} took {total / 1000:.1f} ms (budget {args.max_ms:.0f} ms)")
+        print()
+    
+    if failures:
+        print("❌ Startup regressions:")
+        for failure in failures:
+            print(f"   - {failure}")
+        sys.exit(1)
+    print("✅ No startup regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,13 @@ COSMOS_CONNECTION_STRING = os.getenv("COSMOS_CONNECTION_STRING")
 COSMOS_DATABASE_NAME = os.getenv("COSMOS_DATABASE_NAME", "hr_knowledge_base")
 COSMOS_COLLECTION_NAME = os.getenv("COSMOS_COLLECTION_NAME", "hr_policies")
 VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "vector-hnsw")
+COSMOS_WRITE_BATCH_SIZE = int(os.getenv("COSMOS_WRITE_BATCH_SIZE", "500"))
+
+# Vector Store Backend ("cosmos", or "memory" / "hnsw" for a local, file-backed store)
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "cosmos").lower()
+HNSW_M = int(os.getenv("HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "200"))
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "64"))
 
 # Azure OpenAI Configuration (UNCHANGED)
 AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
@@ -25,18 +32,72 @@ AZURE_OPENAI_API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01")
 EMBEDDING_MODEL_DEPLOYMENT = os.getenv("EMBEDDING_MODEL_DEPLOYMENT", "text-embedding-ada-002")
 CHAT_MODEL_DEPLOYMENT = os.getenv("CHAT_MODEL_DEPLOYMENT", "gpt-4o")
 
+# HR Assistant Conversation Memory
+AGENT_MEMORY_MODE = os.getenv("AGENT_MEMORY_MODE", "stateless")
+AGENT_MEMORY_TURNS = int(os.getenv("AGENT_MEMORY_TURNS", "3"))
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+
 # Document Processing Configuration (UNCHANGED)
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "1000"))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "200"))
 EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "1536"))
+# Ask the model for EMBEDDING_DIMENSIONS (text-embedding-3 models can return
+# shortened vectors, e.g. 384 instead of 1536)
+EMBEDDING_REQUEST_DIMENSIONS = os.getenv("EMBEDDING_REQUEST_DIMENSIONS", "false").lower() == "true"
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", "1"))
+
+# Embedding Batching Configuration
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_BATCH_MAX_TOKENS = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", "32000"))
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "2"))
+
+# Local Cache Configuration
+CACHE_DIR = Path(os.getenv("CACHE_DIR", str(PROJECT_ROOT / ".cache")))
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_PATH = Path(os.getenv("EMBEDDING_CACHE_PATH", str(CACHE_DIR / "embeddings.sqlite3")))
+INGEST_MANIFEST_PATH = Path(os.getenv("INGEST_MANIFEST_PATH", str(CACHE_DIR / "ingest_manifest.json")))
+LOCAL_VECTOR_STORE_PATH = Path(os.getenv("LOCAL_VECTOR_STORE_PATH", str(CACHE_DIR / "vectors.npz")))
+HNSW_INDEX_PATH = Path(os.getenv("HNSW_INDEX_PATH", str(CACHE_DIR / "vectors.hnsw")))
+
+# Answer Cache Configuration (used in stateless memory mode)
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000"))
+ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "86400"))
+ANSWER_CACHE_PATH = os.getenv("ANSWER_CACHE_PATH", str(CACHE_DIR / "answers.json"))
+KB_GENERATION_REFRESH_SECONDS = float(os.getenv("KB_GENERATION_REFRESH_SECONDS", "30"))
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "10000"))
+
+# HTTP API Server Configuration (server.py)
+SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8080"))
+SERVER_MAX_CONCURRENCY = int(os.getenv("SERVER_MAX_CONCURRENCY", "32"))
+
+# Background Daemon Configuration (daemon.py, used by main.py when running)
+DAEMON_SOCKET_PATH = Path(os.getenv("DAEMON_SOCKET_PATH", str(CACHE_DIR / "hr_assistant.sock")))
+DAEMON_MAX_CONCURRENCY = int(os.getenv("DAEMON_MAX_CONCURRENCY", "8"))
+DAEMON_TIMEOUT_SECONDS = float(os.getenv("DAEMON_TIMEOUT_SECONDS", "60"))
+
+# Token Pricing (per 1K tokens, used for cost estimates in usage reports)
+CHAT_PROMPT_COST_PER_1K = float(os.getenv("CHAT_PROMPT_COST_PER_1K", "0.0025"))
+CHAT_COMPLETION_COST_PER_1K = float(os.getenv("CHAT_COMPLETION_COST_PER_1K", "0.01"))
+EMBEDDING_COST_PER_1K = float(os.getenv("EMBEDDING_COST_PER_1K", "0.0001"))
 
 def validate_config():
     """Validate required configuration."""
+    if VECTOR_STORE_BACKEND not in ("cosmos", "memory", "hnsw"):
+        raise ValueError(
+            f"Unknown VECTOR_STORE_BACKEND '{VECTOR_STORE_BACKEND}', expected 'cosmos', 'memory' or 'hnsw'"
+        )
+    
     required_vars = {
-        "COSMOS_CONNECTION_STRING": COSMOS_CONNECTION_STRING,
         "AZURE_OPENAI_ENDPOINT": AZURE_OPENAI_ENDPOINT,
         "AZURE_OPENAI_KEY": AZURE_OPENAI_KEY,
     }
+    if VECTOR_STORE_BACKEND == "cosmos":
+        required_vars["COSMOS_CONNECTION_STRING"] = COSMOS_CONNECTION_STRING
     
     missing = [k for k, v in required_vars.items() if not v]
     
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+HR Q&A Bot - Background Daemon
+Keeps the Azure OpenAI clients and the Cosmos DB connection warm so that
+`python main.py "question"` only pays for the RAG round trip.
+
+Usage:
+    python daemon.py            Run the daemon (e.g. under nohup or systemd)
+    python daemon.py --status   Check whether a daemon is running
+    python daemon.py --stop     Stop the running daemon
+"""
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import settings
+from src.daemon.protocol import DaemonUnavailable, send_command
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run the HR assistant as a background daemon.")
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=settings.DAEMON_SOCKET_PATH,
+        help="Unix socket to listen on"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=settings.DAEMON_MAX_CONCURRENCY,
+        help="Questions answered at once"
+    )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--status", action="store_true", help="Report whether a daemon is running")
+    group.add_argument("--stop", action="store_true", help="Stop the running daemon")
+    return parser.parse_args()
+
+
+async def run_daemon(socket_path: Path, max_concurrency: int):
+    """Initialize the HR assistant once and serve questions until stopped."""
+    from src.bootstrap import bootstrap_hr_team, shutdown_hr_team
+    from src.daemon.unix_server import HRAssistantDaemon
+    
+    print("\n🤖 HR Assistant Daemon - initializing...\n")
+    
+    # Async store: no index management, and questions do not block each
+    # other; every connection has its own conversation
+    hr_team = await bootstrap_hr_team(settings, async_store=True, memory_mode="stateless")
+    
+    try:
+        await HRAssistantDaemon(hr_team, socket_path, max_concurrency).serve()
+    finally:
+        await shutdown_hr_team(hr_team)
+        print(hr_team.usage.format_report("🧾 Daemon token usage") + "\n")
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    
+    if args.status or args.stop:
+        try:
+            reply = asyncio.run(send_command(args.socket, "shutdown" if args.stop else "status"))
+        except DaemonUnavailable:
+            print(f"HR assistant daemon is not running ({args.socket})")
+            sys.exit(1)
+        print(f"HR assistant daemon: {reply.get('status')}"
+              + (f" (pid {reply['pid']})" if "pid" in reply else ""))
+        return
+    
+    try:
+        asyncio.run(run_daemon(args.socket, args.max_concurrency))
+    except KeyboardInterrupt:
+        print("\n👋 Daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
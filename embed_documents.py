@@ -5,40 +5,242 @@ Processes PDF files from the data directory and stores them in Cosmos DB.
 """
 import os
 import sys
+import asyncio
+import argparse
 from pathlib import Path
+from typing import List, Dict, Optional, Tuple
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import settings
 from src.processors.pdf_processor import PDFProcessor
-from src.vector_db.vector_db.cosmos_vector_db import CosmosVectorDB
+from src.processors.embedding_cache import EmbeddingCache
+from src.processors.ingest_manifest import IngestManifest
+from src.monitoring.usage import UsageTracker
+from src.vector_db.vector_db.vector_store import (
+    LOCAL_BACKENDS, VectorStore, open_local_store, vector_store_target
+)
 
 
-def main():
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Embed HR documents into Cosmos DB.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.EMBEDDING_CONCURRENCY,
+        help=f"Embeddings requests kept in flight (default: {settings.EMBEDDING_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--extract-workers",
+        type=int,
+        default=settings.PDF_EXTRACT_WORKERS,
+        help="Processes for PDF text extraction, 0 = one per CPU core "
+             f"(default: {settings.PDF_EXTRACT_WORKERS})"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Reprocess every PDF instead of only new or changed ones"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-embed every chunk instead of reusing the local embedding cache"
+    )
+    args = parser.parse_args()
+    # No embed workers would leave the pipeline waiting forever
+    if args.concurrency < 1:
+        parser.error(f"--concurrency must be at least 1 (got {args.concurrency})")
+    return args
+
+
+# End-of-stream marker passed between pipeline stages
+_DONE = None
+
+
+async def _run_stage(
+    name: str,
+    handler,
+    inbox: asyncio.Queue,
+    outbox: Optional[asyncio.Queue],
+    workers: int = 1,
+    downstream_workers: int = 1
+):
+    """
+    Run `workers` copies of one pipeline stage until its inbox is drained.
+    
+    Each worker takes (pdf_file, payload) items from `inbox`, awaits
+    `handler(item)` and puts a non-None result on `outbox`. Failures are
+    reported per file so one bad PDF does not stall the pipeline. When every
+    worker has seen an end marker, one marker is forwarded per downstream worker.
+    """
+    async def worker():
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                return
+            try:
+                result = await handler(item)
+            except Exception as e:
+                pdf_file = item[0] if isinstance(item, tuple) else item
+                print(f"✗ {name} stage failed for {Path(pdf_file).name}: {e}")
+                continue
+            if result is not None and outbox is not None:
+                await outbox.put(result)
+    
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    if outbox is not None:
+        for _ in range(downstream_workers):
+            await outbox.put(_DONE)
+
+
+async def run_pipeline(
+    pdf_files: List[Path],
+    pdf_processor: PDFProcessor,
+    cosmos_db: VectorStore,
+    concurrency: int,
+    queue_size: int
+) -> Tuple[int, Dict[Path, List[str]]]:
+    """
+    Ingest PDFs through concurrent extract/chunk -> embed -> write stages.
+    
+    Stages are connected by bounded queues, so while file N is being
+    embedded, file N+1 is already being extracted and file N-1 written,
+    and at most `queue_size` finished items wait between any two stages.
+    Pages are chunked as they are extracted, so a file's page texts are
+    never all held at once; only its chunks are, because they are embedded
+    and recorded per file.
+    Embedding runs `concurrency` workers sharing one semaphore, which bounds
+    the requests in flight across all files.
+    
+    Returns:
+        (total number of documents stored, chunk IDs of each fully stored file)
+    """
+    total_documents = 0
+    written: Dict[Path, List[str]] = {}
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    files: asyncio.Queue = asyncio.Queue()
+    for pdf_file in pdf_files:
+        files.put_nowait(pdf_file)
+    files.put_nowait(_DONE)
+    
+    chunks: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    documents: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    
+    async def extract(pdf_file):
+        # CPU-bound; may fan out further into the extraction process pool.
+        # Pages stream straight into the chunker instead of being listed first
+        page_texts = pdf_processor.iter_pdf_pages(str(pdf_file))
+        file_chunks = await asyncio.to_thread(
+            list,
+            pdf_processor.iter_chunks(page_texts, settings.CHUNK_SIZE, settings.CHUNK_OVERLAP)
+        )
+        if file_chunks:
+            print(f"✓ Created {len(file_chunks)} chunks from {pdf_file.name}")
+        return pdf_file, file_chunks
+    
+    async def embed(item):
+        pdf_file, file_chunks = item
+        if not file_chunks:
+            return pdf_file, []
+        embeddings = await pdf_processor.generate_embeddings_async(file_chunks, semaphore=semaphore)
+        
+        # Failed batches leave empty embeddings; drop the file so it is not
+        # recorded and its previous chunks stay until the next run retries it
+        failed = sum(1 for embedding in embeddings if not embedding)
+        if failed:
+            raise RuntimeError(f"{failed}/{len(file_chunks)} chunks could not be embedded")
+        return pdf_file, pdf_processor.build_documents(str(pdf_file), file_chunks, embeddings)
+    
+    async def write(item):
+        nonlocal total_documents
+        pdf_file, file_documents = item
+        if not file_documents:
+            print(f"⚠️  No documents created from {pdf_file.name}")
+            written[pdf_file] = []
+            return
+        
+        print(f"💾 Storing {len(file_documents)} documents from {pdf_file.name} in the vector store...")
+        inserted = await asyncio.to_thread(cosmos_db.insert_documents, file_documents)
+        total_documents += inserted
+        print(f"✓ Successfully stored {inserted} documents from {pdf_file.name}")
+        
+        # Only fully stored files count as ingested; others are retried next run
+        if inserted == len(file_documents):
+            written[pdf_file] = [doc["_id"] for doc in file_documents]
+    
+    await asyncio.gather(
+        _run_stage("extract", extract, files, chunks, downstream_workers=concurrency),
+        _run_stage("embed", embed, chunks, documents, workers=concurrency),
+        _run_stage("write", write, documents, None)
+    )
+    return total_documents, written
+
+
+async def main(
+    concurrency: int,
+    use_cache: bool = True,
+    extract_workers: int = 1,
+    full: bool = False
+):
     """Main embedding pipeline."""
     print("\n" + "="*70)
     print("HR DOCUMENT EMBEDDING PIPELINE")
     print("="*70 + "\n")
     
+    # Open the embedding cache so unchanged chunks are not re-embedded
+    embedding_cache = None
+    if use_cache and settings.EMBEDDING_CACHE_ENABLED:
+        print(f"🗃️  Using embedding cache at {settings.EMBEDDING_CACHE_PATH}")
+        embedding_cache = EmbeddingCache(
+            path=settings.EMBEDDING_CACHE_PATH,
+            model=settings.EMBEDDING_MODEL_DEPLOYMENT,
+            dimensions=settings.EMBEDDING_DIMENSIONS
+        )
+    
     # Initialize PDF Processor
     print("📋 Initializing PDF Processor...")
+    usage_tracker = UsageTracker(
+        prompt_cost_per_1k=settings.CHAT_PROMPT_COST_PER_1K,
+        completion_cost_per_1k=settings.CHAT_COMPLETION_COST_PER_1K,
+        embedding_cost_per_1k=settings.EMBEDDING_COST_PER_1K
+    )
+    
     pdf_processor = PDFProcessor(
         azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
         azure_api_key=settings.AZURE_OPENAI_KEY,
         api_version=settings.AZURE_OPENAI_API_VERSION,
-        embedding_model=settings.EMBEDDING_MODEL_DEPLOYMENT
+        embedding_model=settings.EMBEDDING_MODEL_DEPLOYMENT,
+        batch_size=settings.EMBEDDING_BATCH_SIZE,
+        max_batch_tokens=settings.EMBEDDING_BATCH_MAX_TOKENS,
+        concurrency=concurrency,
+        embedding_cache=embedding_cache,
+        extract_workers=extract_workers,
+        usage_tracker=usage_tracker,
+        embedding_dimensions=settings.EMBEDDING_DIMENSIONS if settings.EMBEDDING_REQUEST_DIMENSIONS else None
     )
     
-    # Initialize Cosmos DB for MongoDB vCore
-    print("🗄️  Initializing Cosmos DB MongoDB vCore Vector Store...")
-    cosmos_db = CosmosVectorDB(
-        connection_string=settings.COSMOS_CONNECTION_STRING,
-        database_name=settings.COSMOS_DATABASE_NAME,
-        collection_name=settings.COSMOS_COLLECTION_NAME,
-        embedding_dimensions=settings.EMBEDDING_DIMENSIONS,
-        vector_index_type=settings.VECTOR_INDEX_TYPE
-    )
+    if settings.VECTOR_STORE_BACKEND in LOCAL_BACKENDS:
+        # Saved to its file (LOCAL_VECTOR_STORE_PATH / HNSW_INDEX_PATH) when closed
+        print(f"🗄️  Initializing local '{settings.VECTOR_STORE_BACKEND}' vector store...")
+        cosmos_db = open_local_store(settings)
+    else:
+        # Initialize Cosmos DB for MongoDB vCore (writable, so the vector index
+        # is ensured first, as `python ensure_index.py` does)
+        from src.vector_db.vector_db.cosmos_vector_db import CosmosVectorDB
+        print("🗄️  Initializing Cosmos DB MongoDB vCore Vector Store...")
+        cosmos_db = CosmosVectorDB(
+            connection_string=settings.COSMOS_CONNECTION_STRING,
+            database_name=settings.COSMOS_DATABASE_NAME,
+            collection_name=settings.COSMOS_COLLECTION_NAME,
+            embedding_dimensions=settings.EMBEDDING_DIMENSIONS,
+            vector_index_type=settings.VECTOR_INDEX_TYPE,
+            write_batch_size=settings.COSMOS_WRITE_BATCH_SIZE
+        )
     
     # Find all PDF files in data directory
     data_dir = settings.DATA_DIR
@@ -48,41 +250,89 @@ def main():
         print(f"⚠️  No PDF files found in {data_dir}")
         return
     
-    print(f"\n📁 Found {len(pdf_files)} PDF file(s) to process:\n")
+    # Compare against the manifest of the previous run into this store;
+    # changing any of these settings changes every chunk, so all files are
+    # reprocessed
+    manifest = IngestManifest(
+        settings.INGEST_MANIFEST_PATH,
+        fingerprint={
+            "chunk_size": settings.CHUNK_SIZE,
+            "chunk_overlap": settings.CHUNK_OVERLAP,
+            "embedding_model": settings.EMBEDDING_MODEL_DEPLOYMENT,
+            "embedding_dimensions": settings.EMBEDDING_DIMENSIONS,
+        },
+        target=vector_store_target(settings)
+    )
+    
+    # A dropped collection or deleted store file leaves nothing to skip
+    if not full and manifest.entries and cosmos_db.count() == 0:
+        print("⚠️  The vector store is empty, reprocessing every PDF")
+        full = True
+    
+    changed_files = [f for f in pdf_files if full or manifest.has_changed(f)]
+    changed_set = set(changed_files)
+    
+    print(f"\n📁 Found {len(pdf_files)} PDF file(s), {len(changed_files)} new or changed:\n")
     for pdf_file in pdf_files:
-        print(f"   • {pdf_file.name}")
+        status = "" if pdf_file in changed_set else " (unchanged, skipped)"
+        print(f"   • {pdf_file.name}{status}")
     print()
     
-    # Process each PDF
     total_documents = 0
+    removed_documents = 0
     
-    for pdf_file in pdf_files:
-        # Process PDF into chunks with embeddings
-        documents = pdf_processor.process_pdf(
-            pdf_path=str(pdf_file),
-            chunk_size=settings.CHUNK_SIZE,
-            overlap=settings.CHUNK_OVERLAP
-        )
+    try:
+        # Drop chunks of PDFs that were deleted since the last run
+        stale_ids = manifest.remove_missing(pdf_files)
+        
+        # Process new and changed PDFs through the staged pipeline
+        if changed_files:
+            total_documents, written = await run_pipeline(
+                changed_files,
+                pdf_processor,
+                cosmos_db,
+                concurrency=concurrency,
+                queue_size=settings.PIPELINE_QUEUE_SIZE
+            )
+            
+            # Drop chunks that changed PDFs no longer produce
+            for pdf_file, chunk_ids in written.items():
+                stale_ids.extend(manifest.record(pdf_file, chunk_ids))
+        
+        stale_ids = manifest.unreferenced(stale_ids)
+        if stale_ids:
+            print(f"🧹 Removing {len(stale_ids)} stale chunks from the vector store...")
+            removed_documents = cosmos_db.delete_documents(stale_ids)
+        
+        manifest.save()
         
-        if documents:
-            # Insert into Cosmos DB
-            print(f"💾 Storing {len(documents)} documents in Cosmos DB...")
-            inserted = cosmos_db.insert_documents(documents)
-            total_documents += inserted
-            print(f"✓ Successfully stored {inserted} documents\n")
-        else:
-            print(f"⚠️  No documents created from {pdf_file.name}\n")
+        # Invalidate cached answers computed against the previous corpus
+        if total_documents or removed_documents:
+            generation = cosmos_db.bump_generation()
+            if generation is not None:
+                print(f"🔄 Knowledge-base generation is now {generation}")
+    finally:
+        await pdf_processor.aclose()
+        cosmos_db.close()
     
     # Summary
     print("\n" + "="*70)
     print(f"✅ EMBEDDING COMPLETE")
     print(f"   Total documents embedded: {total_documents}")
+    print(f"   Stale documents removed: {removed_documents}")
+    print(usage_tracker.format_report("   Token usage (this run)").replace("\n", "\n   "))
     print("="*70 + "\n")
 
 
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        main()
+        asyncio.run(main(
+            args.concurrency,
+            use_cache=not args.no_cache,
+            extract_workers=args.extract_workers,
+            full=args.full
+        ))
     except KeyboardInterrupt:
         print("\n\n⚠️  Process interrupted by user")
         sys.exit(0)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Vector Index Admin Command
+Creates (or checks) the Cosmos DB vector search index.
+
+Query processes open Cosmos DB read-only and never touch the index; it is
+managed here and by embed_documents.py, which runs the same check before
+ingesting. Both need index (DDL) permissions on the collection.
+
+Usage:
+    python ensure_index.py           Create the index if it is missing
+    python ensure_index.py --check   Only report; exit 1 if it is missing
+
+Both exit 1 if the index's dimensions differ from EMBEDDING_DIMENSIONS.
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import settings
+from src.vector_db.vector_db.cosmos_vector_db import CosmosVectorDB, VECTOR_INDEX_NAME
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Create or check the Cosmos DB vector index.")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only check that the index exists (read-only); exit 1 if it does not"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    
+    # Writable mode ensures the index on open; --check stays read-only
+    cosmos_db = CosmosVectorDB(
+        connection_string=settings.COSMOS_CONNECTION_STRING,
+        database_name=settings.COSMOS_DATABASE_NAME,
+        collection_name=settings.COSMOS_COLLECTION_NAME,
+        embedding_dimensions=settings.EMBEDDING_DIMENSIONS,
+        vector_index_type=settings.VECTOR_INDEX_TYPE,
+        read_only=args.check
+    )
+    
+    try:
+        exists = cosmos_db.has_vector_index()
+        cosmos_db.check_vector_index_dimensions()
+    finally:
+        cosmos_db.close()
+    
+    if exists:
+        print(f"✅ Vector index '{VECTOR_INDEX_NAME}' exists")
+    else:
+        print(f"❌ Vector index '{VECTOR_INDEX_NAME}' is missing")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
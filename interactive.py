@@ -6,48 +6,39 @@ Command-line interface for querying the HR knowledge base.
 import os
 import sys
 import asyncio
+import argparse
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import settings
-from src.processors.pdf_processor import PDFProcessor
-from src.vector_db.vector_db.cosmos_vector_db import CosmosVectorDB
-from src.agents.hr_agents import HRAssistantTeam
+from src.monitoring.latency import METRICS
 
 
-async def main():
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Interactive HR Q&A session.")
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print per-stage latency percentiles (embed, search, context, LLM) on exit"
+    )
+    return parser.parse_args()
+
+
+async def main(timings: bool = False):
     """Interactive Q&A session."""
     print("\n" + "="*70)
     print("🤖 HR ASSISTANT BOT - Interactive Mode")
     print("="*70)
     print("\nInitializing system...")
     
-    # Initialize components
-    pdf_processor = PDFProcessor(
-        azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
-        azure_api_key=settings.AZURE_OPENAI_KEY,
-        api_version=settings.AZURE_OPENAI_API_VERSION,
-        embedding_model=settings.EMBEDDING_MODEL_DEPLOYMENT
-    )
+    # Imported after argument parsing so --help stays instant
+    from config import settings
+    from src.bootstrap import bootstrap_hr_team, shutdown_hr_team
     
-    cosmos_db = CosmosVectorDB(
-        connection_string=settings.COSMOS_CONNECTION_STRING,
-        database_name=settings.COSMOS_DATABASE_NAME,
-        collection_name=settings.COSMOS_COLLECTION_NAME,
-        embedding_dimensions=settings.EMBEDDING_DIMENSIONS,
-        vector_index_type=settings.VECTOR_INDEX_TYPE
-    )
-    
-    hr_team = HRAssistantTeam(
-        cosmos_db=cosmos_db,
-        pdf_processor=pdf_processor,
-        azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
-        azure_deployment=settings.CHAT_MODEL_DEPLOYMENT,
-        api_key=settings.AZURE_OPENAI_KEY,
-        api_version=settings.AZURE_OPENAI_API_VERSION
-    )
+    # Initialize components (concurrently)
+    hr_team = await bootstrap_hr_team(settings)
     
     print("\n✅ System ready! You can now ask questions about HR policies.\n")
     print("Commands:")
@@ -72,7 +63,7 @@ async def main():
             
             # Process question
             try:
-                answer = await hr_team.ask_question(question, top_k=5)
+                answer = await hr_team.print_answer_stream(question, top_k=5)
                 print()  # Extra newline for spacing
                 
             except Exception as e:
@@ -84,12 +75,17 @@ async def main():
     
     finally:
         # Cleanup
-        await hr_team.close()
+        await shutdown_hr_team(hr_team)
+        print(hr_team.usage.format_report("🧾 Session token usage") + "\n")
+        if timings:
+            print("⏱️  Stage timings:")
+            print(METRICS.format_report() + "\n")
 
 
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        asyncio.run(main())
+        asyncio.run(main(timings=args.timings))
     except Exception as e:
         print(f"\n❌ Fatal error: {e}")
         import traceback
@@ -7,50 +7,106 @@ import os
 import sys
 import asyncio
 from pathlib import Path
+from typing import Optional
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import settings
-from src.processors.pdf_processor import PDFProcessor
-from src.vector_db.vector_db.cosmos_vector_db import CosmosVectorDB
-from src.agents.hr_agents import HRAssistantTeam
+# Standard library only; everything heavier (including config.settings, which
+# validates the environment) is imported where it is needed, so the usage
+# and daemon paths start quickly
+from src.daemon.protocol import DaemonTimeout, DaemonUnavailable, ask_daemon
+from src.monitoring.usage import format_question_usage
 
 
-async def ask_single_question(question: str):
+async def ask_via_daemon(
+    socket_path: Path,
+    question: str,
+    timings: bool = False,
+    timeout: Optional[float] = None
+) -> bool:
+    """
+    Forward a question to a running daemon (see daemon.py).
+    
+    Args:
+        socket_path: Daemon socket
+        question: Employee's question
+        timings: Print the daemon's stage timings
+        timeout: Seconds to wait for the daemon to start answering (None =
+            no limit); a streaming answer is not cut off
+    
+    Returns:
+        True if the daemon answered (or failed after part of the answer was
+        printed), False if no daemon is running or it did not start
+        answering within `timeout`
+    """
+    header_printed = False
+    
+    def print_token(token: str):
+        nonlocal header_printed
+        if not header_printed:
+            print(f"{'='*60}")
+            print("ANSWER:")
+            header_printed = True
+        print(token, end="", flush=True)
+    
+    try:
+        reply = await ask_daemon(
+            socket_path, question, top_k=5, on_token=print_token, timings=timings,
+            first_message_timeout=timeout
+        )
+    except DaemonTimeout:
+        print(f"⚠️  The daemon did not answer within {timeout:g}s, answering in-process\n")
+        return False
+    except DaemonUnavailable:
+        return False
+    except (RuntimeError, OSError, ValueError) as e:
+        if not header_printed:
+            raise
+        # Part of the answer is already on screen; asking again would repeat it
+        print(f"\n{'='*60}")
+        print(f"❌ The daemon failed mid-answer: {e}\n")
+        return True
+    
+    if header_printed:
+        print(f"\n{'='*60}")
+    if reply.get("usage"):
+        print(format_question_usage(reply["usage"]))
+    print()
+    if reply.get("timings"):
+        print("⏱️  Stage timings (daemon):")
+        print(reply["timings"] + "\n")
+    return True
+
+
+async def ask_single_question(question: str, timings: bool = False):
     """Ask a single question and exit."""
+    from config import settings
+    
     print("\n🤖 HR Assistant Bot - Single Question Mode\n")
     
-    # Initialize components
-    pdf_processor = PDFProcessor(
-        azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
-        azure_api_key=settings.AZURE_OPENAI_KEY,
-        api_version=settings.AZURE_OPENAI_API_VERSION,
-        embedding_model=settings.EMBEDDING_MODEL_DEPLOYMENT
-    )
+    if await ask_via_daemon(
+        settings.DAEMON_SOCKET_PATH, question, timings=timings,
+        timeout=settings.DAEMON_TIMEOUT_SECONDS
+    ):
+        return
     
-    cosmos_db = CosmosVectorDB(
-        connection_string=settings.COSMOS_CONNECTION_STRING,
-        database_name=settings.COSMOS_DATABASE_NAME,
-        collection_name=settings.COSMOS_COLLECTION_NAME,
-        embedding_dimensions=settings.EMBEDDING_DIMENSIONS,
-        vector_index_type=settings.VECTOR_INDEX_TYPE
-    )
+    # No daemon running: initialize everything in this process. Imported
+    # here so answers forwarded to the daemon skip loading these modules.
+    from src.bootstrap import bootstrap_hr_team, shutdown_hr_team
+    from src.monitoring.latency import METRICS
     
-    hr_team = HRAssistantTeam(
-        cosmos_db=cosmos_db,
-        pdf_processor=pdf_processor,
-        azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
-        azure_deployment=settings.CHAT_MODEL_DEPLOYMENT,
-        api_key=settings.AZURE_OPENAI_KEY,
-        api_version=settings.AZURE_OPENAI_API_VERSION
-    )
+    hr_team = await bootstrap_hr_team(settings)
     
     try:
-        answer = await hr_team.ask_question(question, top_k=5)
+        answer = await hr_team.print_answer_stream(question, top_k=5)
         return answer
     finally:
-        await hr_team.close()
+        await shutdown_hr_team(hr_team)
+        print(hr_team.usage.format_report("🧾 Token usage") + "\n")
+        if timings:
+            print("⏱️  Stage timings:")
+            print(METRICS.format_report() + "\n")
 
 
 def print_usage():
@@ -60,9 +116,13 @@ HR Q&A Bot - Usage:
 
 1. Single Question Mode:
    python main.py "What is the leave policy?"
+   python main.py --timings "What is the leave policy?"   (print stage latencies)
+   
+   Questions are forwarded to the daemon (python daemon.py) when it is
+   running, skipping client setup; otherwise they are answered in-process.
 
 2. Interactive Mode:
-   python interactive.py
+   python interactive.py [--timings]
 
 3. Embed Documents:
    python embed_documents.py
@@ -79,16 +139,20 @@ Environment:
 
 def main():
     """Main entry point."""
-    if len(sys.argv) < 2:
+    args = sys.argv[1:]
+    timings = "--timings" in args
+    args = [arg for arg in args if arg != "--timings"]
+    
+    if not args:
         print("\n⚠️  No question provided!")
         print_usage()
         sys.exit(1)
     
     # Get question from command line
-    question = " ".join(sys.argv[1:])
+    question = " ".join(args)
     
     try:
-        asyncio.run(ask_single_question(question))
+        asyncio.run(ask_single_question(question, timings=timings))
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user")
         sys.exit(0)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+HR Q&A Bot - HTTP API Server
+Serves many concurrent employees from one warm process.
+
+Endpoints:
+    GET  /health       Liveness and current load
+    GET  /metrics      Stage latency percentiles and token usage
+    POST /ask          {"question": "...", "top_k": 5} -> {"answer": "...", "usage": {...}}
+    POST /ask/stream   Same body; the answer is streamed back as plain text
+"""
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Tuple
+
+from aiohttp import web
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import settings
+from src.agents.hr_agents import HRAssistantTeam
+from src.bootstrap import bootstrap_hr_team, shutdown_hr_team
+from src.monitoring.latency import METRICS
+
+
+# Upper bound for the top_k a client may request
+MAX_TOP_K = 20
+
+
+class ServerState:
+    """
+    Components shared by all requests.
+    
+    One HRAssistantTeam (model client, vector store connection pool and
+    answer caches) serves every request; each request gets its own
+    conversation via `create_session`. A semaphore caps the questions being
+    answered at once; further requests wait for a free slot.
+    """
+    
+    def __init__(self, hr_team: HRAssistantTeam, max_concurrency: int):
+        self.hr_team = hr_team
+        self.max_concurrency = max(1, max_concurrency)
+        self.limiter = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+    
+    async def __aenter__(self):
+        self.waiting += 1
+        try:
+            await self.limiter.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.in_flight -= 1
+        self.limiter.release()
+
+
+STATE_KEY = web.AppKey("state", ServerState)
+MAX_CONCURRENCY_KEY = web.AppKey("max_concurrency", int)
+
+
+async def read_question(request: web.Request) -> Tuple[str, int]:
+    """
+    Parse and validate an ask request body.
+    
+    Returns:
+        (question, top_k)
+    
+    Raises:
+        web.HTTPBadRequest: If the body is not valid
+    """
+    try:
+        body = await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(text="Request body must be JSON")
+    if not isinstance(body, dict):
+        raise web.HTTPBadRequest(text="Request body must be a JSON object")
+    
+    question = body.get("question")
+    if not isinstance(question, str) or not question.strip():
+        raise web.HTTPBadRequest(text="'question' must be a non-empty string")
+    
+    top_k = body.get("top_k", 5)
+    if not isinstance(top_k, int) or isinstance(top_k, bool) or not 1 <= top_k <= MAX_TOP_K:
+        raise web.HTTPBadRequest(text=f"'top_k' must be an integer between 1 and {MAX_TOP_K}")
+    
+    return question.strip(), top_k
+
+
+async def handle_health(request: web.Request) -> web.Response:
+    """Report liveness and load."""
+    state = request.app[STATE_KEY]
+    return web.json_response({
+        "status": "ok",
+        "in_flight": state.in_flight,
+        "waiting": state.waiting,
+        "max_concurrency": state.max_concurrency,
+    })
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    """Report stage latency percentiles and token usage totals."""
+    state = request.app[STATE_KEY]
+    return web.json_response({
+        "timings": METRICS.snapshot(),
+        "usage": state.hr_team.usage.snapshot(),
+    })
+
+
+async def handle_ask(request: web.Request) -> web.Response:
+    """Answer a question and return the complete answer."""
+    state = request.app[STATE_KEY]
+    question, top_k = await read_question(request)
+    usage_entries = []
+    
+    async with state:
+        try:
+            parts = [
+                token async for token in state.hr_team.ask_question_stream(
+                    question,
+                    top_k,
+                    on_usage=usage_entries.append,
+                    agent=state.hr_team.create_session()
+                )
+            ]
+        except Exception as e:
+            print(f"❌ Error processing question: {e}")
+            return web.json_response({"error": "Failed to answer the question"}, status=500)
+    
+    return web.json_response({
+        "answer": "".join(parts),
+        "usage": usage_entries[0] if usage_entries else None,
+    })
+
+
+async def handle_ask_stream(request: web.Request) -> web.StreamResponse:
+    """Answer a question, streaming answer text as it is generated."""
+    state = request.app[STATE_KEY]
+    question, top_k = await read_question(request)
+    
+    async with state:
+        response = web.StreamResponse(headers={"Content-Type": "text/plain; charset=utf-8"})
+        await response.prepare(request)
+        try:
+            async for token in state.hr_team.ask_question_stream(
+                question,
+                top_k,
+                agent=state.hr_team.create_session()
+            ):
+                await response.write(token.encode("utf-8"))
+        except ConnectionResetError:
+            # Client went away; nothing left to send
+            return response
+        except Exception as e:
+            # Status is already sent, so the error can only be logged
+            print(f"❌ Error processing question: {e}")
+    
+    await response.write_eof()
+    return response
+
+
+async def team_context(app: web.Application):
+    """Create the shared team on startup and close it on shutdown."""
+    # Async store gives a Motor connection pool shared by all requests; every
+    # request has its own conversation, so history is never shared
+    hr_team = await bootstrap_hr_team(settings, async_store=True, memory_mode="stateless")
+    app[STATE_KEY] = ServerState(hr_team, app[MAX_CONCURRENCY_KEY])
+    print(f"\n✅ HR Assistant API ready (max {app[MAX_CONCURRENCY_KEY]} concurrent questions)\n")
+    
+    yield
+    
+    await shutdown_hr_team(hr_team)
+    print(hr_team.usage.format_report("🧾 Server token usage"))
+
+
+def create_app(max_concurrency: int) -> web.Application:
+    """Create the aiohttp application."""
+    app = web.Application()
+    app[MAX_CONCURRENCY_KEY] = max_concurrency
+    app.cleanup_ctx.append(team_context)
+    app.router.add_get("/health", handle_health)
+    app.router.add_get("/metrics", handle_metrics)
+    app.router.add_post("/ask", handle_ask)
+    app.router.add_post("/ask/stream", handle_ask_stream)
+    return app
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Serve the HR assistant over HTTP.")
+    parser.add_argument("--host", default=settings.SERVER_HOST, help="Interface to bind")
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT, help="Port to listen on")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=settings.SERVER_MAX_CONCURRENCY,
+        help="Questions answered at once; further requests wait for a free slot"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    web.run_app(create_app(args.max_concurrency), host=args.host, port=args.port)
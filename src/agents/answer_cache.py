@@ -0,0 +1,142 @@
+"""
+Exact-match answer cache for the HR assistant.
+
+Answers are keyed by normalized question text, top_k and the knowledge-base
+generation ID. Ingestion bumps the generation, so answers computed against
+an older corpus simply stop matching and age out. Entries are evicted
+least-recently-used beyond `max_entries` and expire after `ttl_seconds`;
+the cache can optionally be persisted to a JSON file between runs.
+"""
+import os
+import re
+import json
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize a question for exact matching.
+    
+    Case, surrounding/repeated whitespace and trailing punctuation are
+    ignored, so "How many vacation days do I get?" and
+    "how many  vacation days do i get" share an entry.
+    """
+    question = re.sub(r"\s+", " ", question.strip().lower())
+    return question.rstrip("?!. ")
+
+
+class AnswerCache:
+    """
+    LRU + TTL cache of generated answers.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: float = 86400,
+        path: Optional[str] = None
+    ):
+        """
+        Create the cache, loading persisted entries if `path` exists.
+        
+        Args:
+            max_entries: Maximum cached answers (least recently used evicted first)
+            ttl_seconds: Seconds an answer stays valid (0 = no expiry)
+            path: Optional JSON file to persist the cache to on `save()`
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.path = Path(path) if path else None
+        # key -> (answer, created_at)
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+        if self.path and self.path.exists():
+            self._load()
+    
+    @staticmethod
+    def _key(question: str, top_k: int, generation: str) -> str:
+        return json.dumps([str(generation), top_k, normalize_question(question)])
+    
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+    
+    def get(self, question: str, top_k: int, generation: str) -> Optional[str]:
+        """
+        Look up a cached answer.
+        
+        Args:
+            question: Employee's question
+            top_k: Number of documents the answer was generated from
+            generation: Current knowledge-base generation ID
+        
+        Returns:
+            Cached answer, or None on a miss
+        """
+        key = self._key(question, top_k, generation)
+        entry = self._entries.get(key)
+        
+        if entry is None or self._expired(entry[1]):
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+    
+    def put(self, question: str, top_k: int, generation: str, answer: str) -> None:
+        """
+        Cache an answer.
+        
+        Args:
+            question: Employee's question
+            top_k: Number of documents the answer was generated from
+            generation: Knowledge-base generation ID the answer was generated from
+            answer: Generated answer
+        """
+        key = self._key(question, top_k, generation)
+        self._entries[key] = (answer, time.time())
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _load(self):
+        """Load persisted entries, skipping expired ones."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                entries = json.load(file).get("entries", [])
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable answer cache {self.path}: {e}")
+            return
+        
+        # Stored oldest first, so LRU order survives the round trip
+        for key, answer, created_at in entries[-self.max_entries:]:
+            if not self._expired(created_at):
+                self._entries[key] = (answer, created_at)
+    
+    def save(self):
+        """Persist the cache to `path` atomically (no-op without a path)."""
+        if not self.path:
+            return
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        entries = [
+            [key, answer, created_at]
+            for key, (answer, created_at) in self._entries.items()
+            if not self._expired(created_at)
+        ]
+        
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"version": 1, "entries": entries}, file)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,157 @@
+"""
+Context assembly for RAG prompts.
+
+Retrieved chunks often overlap: `chunk_text` repeats CHUNK_OVERLAP characters
+between neighbouring chunks, and top-k search frequently returns neighbours
+together. This module merges adjacent chunks of the same source, strips the
+repeated overlap, and packs the result into a token budget so the prompt
+carries each piece of text once.
+"""
+from typing import List, Dict, Any
+
+from ..processors.pdf_processor import estimate_tokens
+
+
+# Shorter suffix/prefix matches are treated as coincidence, not chunk overlap
+MIN_OVERLAP_MATCH = 20
+
+
+def _overlap_length(previous: str, following: str, max_overlap: int) -> int:
+    """
+    Length of the longest suffix of `previous` that is a prefix of `following`.
+    
+    Chunks are stripped after slicing, so the shared region can be a little
+    shorter than the configured overlap; it is never longer.
+    """
+    limit = min(len(previous), len(following), max_overlap)
+    for length in range(limit, MIN_OVERLAP_MATCH - 1, -1):
+        if previous.endswith(following[:length]):
+            return length
+    return 0
+
+
+def _merge_contents(contents: List[str], max_overlap: int) -> str:
+    """Join consecutive chunks, dropping the text repeated between them."""
+    merged = contents[0]
+    for content in contents[1:]:
+        overlap = _overlap_length(merged, content, max_overlap)
+        merged += content[overlap:] if overlap else "\n" + content
+    return merged
+
+
+def merge_adjacent_chunks(
+    results: List[Dict[str, Any]],
+    chunk_overlap: int
+) -> List[Dict[str, Any]]:
+    """
+    Merge search results that are consecutive chunks of the same source.
+    
+    Args:
+        results: Vector search results in relevance order
+        chunk_overlap: Overlap used when the documents were chunked
+    
+    Returns:
+        Sections in relevance order (by their best-ranked chunk), each with
+        source, first/last chunk_id, merged content and the best chunk's
+        similarity
+    """
+    # Group by source, remembering each chunk's rank; drop duplicates
+    by_source: Dict[str, List[tuple]] = {}
+    standalone: List[tuple] = []
+    seen = set()
+    
+    for rank, result in enumerate(results):
+        metadata = result.get("metadata", {})
+        source = metadata.get("source", "Unknown")
+        chunk_id = metadata.get("chunk_id")
+        
+        if chunk_id is None:
+            standalone.append((rank, source, None, result))
+            continue
+        if (source, chunk_id) in seen:
+            continue
+        seen.add((source, chunk_id))
+        by_source.setdefault(source, []).append((rank, source, chunk_id, result))
+    
+    sections = []
+    
+    for chunks in by_source.values():
+        chunks.sort(key=lambda item: item[2])
+        run = [chunks[0]]
+        for item in chunks[1:]:
+            if item[2] == run[-1][2] + 1:
+                run.append(item)
+            else:
+                sections.append(run)
+                run = [item]
+        sections.append(run)
+    
+    sections.extend([item] for item in standalone)
+    
+    merged = []
+    for run in sections:
+        best = min(run, key=lambda item: item[0])
+        merged.append({
+            "rank": best[0],
+            "source": best[1],
+            "first_chunk_id": run[0][2],
+            "last_chunk_id": run[-1][2],
+            "similarity": best[3].get("similarity", 1.0),
+            "content": _merge_contents(
+                [item[3].get("content", "") for item in run], chunk_overlap
+            ),
+        })
+    
+    merged.sort(key=lambda section: section["rank"])
+    return merged
+
+
+def pack_context(
+    results: List[Dict[str, Any]],
+    token_budget: int,
+    chunk_overlap: int
+) -> str:
+    """
+    Build the prompt context from search results within a token budget.
+    
+    Sections are added in relevance order; a section that does not fit is
+    skipped in favour of smaller, less relevant ones. If not even the most
+    relevant section fits, it is truncated to the budget.
+    
+    Args:
+        results: Vector search results in relevance order
+        token_budget: Maximum estimated tokens for the context
+        chunk_overlap: Overlap used when the documents were chunked
+    
+    Returns:
+        Context text with one labelled block per section
+    """
+    context_parts = []
+    used_tokens = 0
+    
+    for section in merge_adjacent_chunks(results, chunk_overlap):
+        # Every backend returns cosine similarity (1 = same direction)
+        similarity_score = section["similarity"]
+        header = f"Source: {section['source']}"
+        if section["first_chunk_id"] is not None:
+            if section["first_chunk_id"] == section["last_chunk_id"]:
+                header += f", chunk {section['first_chunk_id']}"
+            else:
+                header += f", chunks {section['first_chunk_id']}-{section['last_chunk_id']}"
+        part = (
+            f"[Document {len(context_parts) + 1} - {header} "
+            f"(Relevance: {similarity_score:.2%})]\n{section['content']}\n"
+        )
+        
+        tokens = estimate_tokens(part)
+        if used_tokens + tokens > token_budget:
+            if context_parts:
+                continue
+            # ~4 characters per token, matching estimate_tokens
+            part = part[:max(0, token_budget * 4)]
+            tokens = estimate_tokens(part)
+        
+        context_parts.append(part)
+        used_tokens += tokens
+    
+    return "\n".join(context_parts)
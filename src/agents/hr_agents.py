@@ -2,17 +2,93 @@
 AutoGen v0.7.5 HR agents and team setup.
 Uses the modern AutoGen 0.7.5 API for multi-agent orchestration.
 """
+import time
 import asyncio
-from typing import List
+import inspect
+from typing import TYPE_CHECKING, List, Dict, Any, AsyncIterator, Callable, NamedTuple, Optional
 from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.messages import TextMessage
-from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import ModelClientStreamingChunkEvent, TextMessage
 from autogen_core import CancellationToken
+from autogen_core.model_context import (
+    BufferedChatCompletionContext,
+    ChatCompletionContext,
+    UnboundedChatCompletionContext,
+)
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
 
-from ..vector_db.vector_db.cosmos_vector_db import CosmosVectorDB
 from ..processors.pdf_processor import PDFProcessor
+from .context_packer import pack_context
+from .answer_cache import AnswerCache
+from ..monitoring.latency import METRICS
+from ..monitoring.usage import TokenUsage, UsageTracker, format_question_usage, response_tokens
+
+if TYPE_CHECKING:
+    # Annotations only: callers import what they use, so the query path
+    # loads neither Motor nor NumPy unless it needs them
+    from ..vector_db.vector_db.vector_store import VectorStore
+    from .semantic_cache import SemanticAnswerCache  # NumPy, only when enabled
+
+
+HR_ASSISTANT_SYSTEM_MESSAGE = """You are a helpful and professional HR assistant for employees.
+            
+Your responsibilities:
+- Answer employee questions about company policies, benefits, leave, and HR topics
+- Base all answers strictly on the provided context from official HR documents
+- If the information is not in the context, clearly state: "I don't have that information in the HR documents"
+- Be concise, accurate, and professional in your responses
+- Always cite the source document when providing information
+
+CRITICAL RULE: Never make up or infer information. Only use facts explicitly stated in the provided context."""
+
+# Conversation memory policies for the HR assistant:
+# - 'stateless': every question is answered with an empty history
+# - 'window': only the last `memory_turns` question/answer pairs are resent
+# - 'unbounded': the whole session history is resent (cost grows per question)
+MEMORY_MODES = ("stateless", "window", "unbounded")
+
+
+class PreparedQuestion(NamedTuple):
+    """Outcome of the retrieval half of the RAG pipeline."""
+    cached_answer: Optional[str]   # Answer from a cache, if any
+    prompt: Optional[str]          # Augmented prompt to send otherwise
+    generation: Optional[str]      # Knowledge-base generation used for caching
+    embedding: List[float]         # Question embedding
+    usage: TokenUsage              # Tokens spent on the question so far
+
+
+def create_model_client(
+    azure_endpoint: str,
+    azure_deployment: str,
+    api_key: str,
+    api_version: str
+) -> AzureOpenAIChatCompletionClient:
+    """Create the Azure OpenAI chat client used by the HR assistant."""
+    return AzureOpenAIChatCompletionClient(
+        azure_endpoint=azure_endpoint,
+        model=azure_deployment,
+        api_version=api_version,
+        azure_deployment=azure_deployment,
+        api_key=api_key,
+        temperature=0.0,  # Deterministic responses for consistent answers
+        stream_options={"include_usage": True}  # Token counts for streamed answers
+    )
+
+
+async def warm_up_model_client(model_client: AzureOpenAIChatCompletionClient) -> None:
+    """
+    Open the chat client's HTTPS connection ahead of the first question.
+    
+    Lists models through the underlying OpenAI client, which costs no
+    tokens; failures are ignored since the first real request retries anyway.
+    """
+    client = getattr(model_client, "_client", None)
+    if client is None:
+        return
+    try:
+        await client.models.list()
+    except Exception:
+        pass
 
 
 class HRAssistantTeam:
@@ -27,98 +103,206 @@ class HRAssistantTeam:
     
     def __init__(
         self,
-        cosmos_db: CosmosVectorDB,
+        cosmos_db: "VectorStore",
         pdf_processor: PDFProcessor,
         azure_endpoint: str,
         azure_deployment: str,
         api_key: str,
-        api_version: str
+        api_version: str,
+        memory_mode: str = "stateless",
+        memory_turns: int = 3,
+        context_token_budget: int = 3000,
+        chunk_overlap: int = 200,
+        answer_cache: Optional[AnswerCache] = None,
+        semantic_cache: Optional["SemanticAnswerCache"] = None,
+        generation_refresh_seconds: float = 30.0,
+        usage_tracker: Optional[UsageTracker] = None,
+        model_client: Optional[AzureOpenAIChatCompletionClient] = None
     ):
         """
         Initialize HR Assistant Team with AutoGen 0.7.5 components.
         
         Args:
-            cosmos_db: Cosmos DB vector database instance for document retrieval
+            cosmos_db: Vector store for document retrieval (CosmosVectorDB,
+                AsyncCosmosVectorDB to avoid blocking the event loop, or
+                InMemoryVectorStore)
             pdf_processor: PDF processor instance for embedding generation
             azure_endpoint: Azure OpenAI endpoint URL (e.g., https://your-resource.openai.azure.com/)
             azure_deployment: Chat model deployment name (e.g., 'gpt-4o')
             api_key: Azure OpenAI API key for authentication
             api_version: Azure OpenAI API version (e.g., '2024-02-01')
+            memory_mode: Conversation memory policy, one of MEMORY_MODES
+                (default 'stateless' keeps per-question cost flat)
+            memory_turns: Previous question/answer pairs kept in 'window' mode
+            context_token_budget: Maximum estimated tokens of retrieved context
+                per prompt
+            chunk_overlap: Overlap used when the documents were chunked, so
+                repeated text between adjacent chunks can be stripped
+            answer_cache: Optional exact-match answer cache, used in
+                'stateless' memory mode where answers do not depend on history
+            semantic_cache: Optional cache serving answers of near-identical
+                previous questions (by embedding similarity), also stateless only
+            generation_refresh_seconds: How long a knowledge-base generation
+                ID read from the vector store is reused before re-reading it
+            usage_tracker: Session token usage tracker (default: the
+                PDF processor's, so embedding and chat tokens add up together)
+            model_client: Chat client from `create_model_client` (default: a
+                new one from the Azure arguments above)
         """
+        if memory_mode not in MEMORY_MODES:
+            raise ValueError(f"Unknown memory mode '{memory_mode}', expected one of {MEMORY_MODES}")
+        
         self.cosmos_db = cosmos_db
         self.pdf_processor = pdf_processor
+        self.memory_mode = memory_mode
+        self.memory_turns = max(0, memory_turns)
+        self.context_token_budget = context_token_budget
+        self.chunk_overlap = chunk_overlap
+        self.answer_cache = answer_cache
+        self.semantic_cache = semantic_cache
+        self.generation_refresh_seconds = generation_refresh_seconds
+        self.usage = usage_tracker or pdf_processor.usage
+        self._generation: Optional[str] = None
+        self._generation_checked_at = 0.0
         
         # Initialize Azure OpenAI chat client using AutoGen 0.7.5 API
-        self.model_client = AzureOpenAIChatCompletionClient(
-            azure_endpoint=azure_endpoint,
-            model=azure_deployment,
-            api_version=api_version,
-            azure_deployment=azure_deployment,
-            api_key=api_key,
-            temperature=0.0  # Deterministic responses for consistent answers
+        self.model_client = model_client or create_model_client(
+            azure_endpoint, azure_deployment, api_key, api_version
         )
         
         # Create HR Assistant Agent using AutoGen 0.7.5 AssistantAgent
-        self.hr_assistant = AssistantAgent(
+        self.hr_assistant = self._create_agent()
+    
+    def _create_model_context(self) -> ChatCompletionContext:
+        """Create the agent's model context according to the memory policy."""
+        if self.memory_mode == "window":
+            # Each turn is a user prompt plus the answer; +1 for the new question
+            return BufferedChatCompletionContext(buffer_size=2 * self.memory_turns + 1)
+        return UnboundedChatCompletionContext()
+    
+    def _create_agent(self) -> AssistantAgent:
+        """Create an HR assistant agent sharing this team's model client."""
+        return AssistantAgent(
             name="hr_assistant",
             model_client=self.model_client,
-            system_message="""You are a helpful and professional HR assistant for employees.
-            
-Your responsibilities:
-- Answer employee questions about company policies, benefits, leave, and HR topics
-- Base all answers strictly on the provided context from official HR documents
-- If the information is not in the context, clearly state: "I don't have that information in the HR documents"
-- Be concise, accurate, and professional in your responses
-- Always cite the source document when providing information
-
-CRITICAL RULE: Never make up or infer information. Only use facts explicitly stated in the provided context."""
+            model_context=self._create_model_context(),
+            system_message=HR_ASSISTANT_SYSTEM_MESSAGE,
+            model_client_stream=True  # Emit tokens as they arrive for ask_question_stream
         )
     
-    async def ask_question(self, question: str, top_k: int = 5) -> str:
+    def create_session(self) -> AssistantAgent:
         """
-        Ask the HR assistant a question using RAG (Retrieval-Augmented Generation).
+        Create a separate conversation for concurrent callers.
         
-        This method implements the complete RAG pipeline:
-        1. Convert question to embedding vector
-        2. Search vector database for relevant document chunks
-        3. Build context from retrieved chunks
-        4. Send context + question to AutoGen agent
-        5. Return generated answer
+        The returned agent shares the model client, vector store and caches
+        but has its own conversation history; pass it as `agent` to
+        `ask_question` / `ask_question_stream` so simultaneous questions do
+        not interleave in one model context.
+        """
+        return self._create_agent()
+    
+    async def _call_store(self, method_name: str, *args, **kwargs):
+        """
+        Call a vector store method without blocking the event loop.
+        
+        Async stores are awaited directly; synchronous stores run in a
+        worker thread so other questions keep making progress meanwhile.
+        """
+        method = getattr(self.cosmos_db, method_name)
+        if inspect.iscoroutinefunction(method):
+            return await method(*args, **kwargs)
+        return await asyncio.to_thread(method, *args, **kwargs)
+    
+    async def _search(self, query_embedding: List[float], top_k: int) -> List[Dict[str, Any]]:
+        """Run vector search without blocking the event loop."""
+        return await self._call_store("search", query_embedding=query_embedding, top_k=top_k)
+    
+    async def _kb_generation(self) -> Optional[str]:
+        """
+        Return the knowledge-base generation ID, re-read at most every
+        `generation_refresh_seconds` so cache lookups stay local.
+        """
+        now = time.monotonic()
+        if self._generation is not None and now - self._generation_checked_at < self.generation_refresh_seconds:
+            return self._generation
+        
+        if hasattr(self.cosmos_db, "get_generation"):
+            self._generation = await self._call_store("get_generation")
+        else:
+            self._generation = "0"
+        self._generation_checked_at = now
+        return self._generation
+    
+    def _print_answer(self, answer: str):
+        """Print an answer between separators."""
+        print(f"{'='*60}")
+        print(f"ANSWER:\n{answer}")
+        print(f"{'='*60}\n")
+    
+    async def _prepare_question(
+        self,
+        question: str,
+        top_k: int,
+        agent: AssistantAgent
+    ) -> PreparedQuestion:
+        """
+        Run the retrieval half of the RAG pipeline for a question.
+        
+        Checks the answer caches, embeds the question, searches the vector
+        store and builds the augmented prompt. Shared by `ask_question` and
+        `ask_question_stream`.
         
         Args:
             question: Employee's question about HR policies
-            top_k: Number of most relevant documents to retrieve (default: 5)
+            top_k: Number of most relevant documents to retrieve
+            agent: Conversation the prompt will be sent to
             
         Returns:
-            Assistant's answer based on retrieved context
+            PreparedQuestion with either a cached answer or the prompt to send
         """
         print(f"\n{'='*60}")
         print(f"QUESTION: {question}")
         print(f"{'='*60}\n")
         
+        usage = TokenUsage()
+        
+        # Serve repeated questions from the answer caches. Only in stateless
+        # mode, where an answer cannot depend on earlier turns. (Compared to
+        # None: the caches define __len__, so an empty one is falsy.)
+        generation = None
+        has_cache = self.answer_cache is not None or self.semantic_cache is not None
+        if self.memory_mode == "stateless" and has_cache:
+            generation = await self._kb_generation()
+        
+        if generation is not None and self.answer_cache is not None:
+            cached_answer = self.answer_cache.get(question, top_k, generation)
+            if cached_answer is not None:
+                print(f"⚡ Answer served from cache\n")
+                return PreparedQuestion(cached_answer, None, generation, [], usage)
+        
         # Step 1: Convert question to embedding vector (1536 dimensions)
-        question_embedding = self.pdf_processor.generate_embedding(question)
+        with METRICS.timer("ask.embed"):
+            question_embedding = await self.pdf_processor.generate_embedding_async(question, usage)
+        
+        # A near-identical earlier question skips search and generation
+        if generation is not None and self.semantic_cache is not None:
+            match = self.semantic_cache.get(question_embedding, top_k, generation)
+            if match is not None:
+                cached_answer, similarity = match
+                print(f"⚡ Answer served from semantic cache (similarity {similarity:.3f})\n")
+                if self.answer_cache is not None:
+                    self.answer_cache.put(question, top_k, generation, cached_answer)
+                return PreparedQuestion(cached_answer, None, generation, question_embedding, usage)
         
         # Step 2: Search Cosmos DB vector store for semantically similar documents
         print(f"🔍 Searching for relevant documents in vector database...")
-        results = self.cosmos_db.search(
-            query_embedding=question_embedding,
-            top_k=top_k
-        )
+        with METRICS.timer("ask.search"):
+            results = await self._search(question_embedding, top_k)
         
-        # Step 3: Build context from retrieved documents with relevance scores
-        context_parts = []
-        for i, result in enumerate(results, 1):
-            source = result.get("metadata", {}).get("source", "Unknown")
-            content = result.get("content", "")
-            # Convert distance to similarity percentage
-            similarity_score = 1 - result.get("similarity", 1.0)
-            
-            context_parts.append(
-                f"[Document {i} - Source: {source} (Relevance: {similarity_score:.2%})]\n{content}\n"
-            )
-        
-        context = "\n".join(context_parts)
+        # Step 3: Build context from retrieved documents with relevance scores,
+        # merging adjacent chunks and packing them into the token budget
+        with METRICS.timer("ask.context"):
+            context = pack_context(results, self.context_token_budget, self.chunk_overlap)
         
         # Step 4: Create augmented prompt combining context + question
         # This is the core of RAG - injecting retrieved context into the LLM prompt
@@ -134,24 +318,199 @@ INSTRUCTIONS:
 - If the context doesn't contain enough information to answer, explicitly state that
 - Cite the source document when providing information"""
         
+        if self.memory_mode == "stateless":
+            # Drop previous turns so each question costs the same
+            await agent.model_context.clear()
+        
+        return PreparedQuestion(None, augmented_message, generation, question_embedding, usage)
+    
+    def _remember_answer(self, question: str, top_k: int, prepared: PreparedQuestion, answer: str):
+        """Store a freshly generated answer in the answer caches."""
+        if prepared.generation is None:
+            return
+        if self.answer_cache is not None:
+            self.answer_cache.put(question, top_k, prepared.generation, answer)
+        if self.semantic_cache is not None:
+            self.semantic_cache.put(prepared.embedding, top_k, prepared.generation, answer)
+    
+    def _record_usage(
+        self,
+        question: str,
+        prepared: PreparedQuestion,
+        models_usage: Any = None
+    ) -> Dict[str, Any]:
+        """
+        Record the chat tokens reported for an answer and log the question's usage.
+        
+        Returns:
+            The question's usage entry (see UsageTracker.record_question)
+        """
+        prompt_tokens = response_tokens(models_usage, "prompt_tokens")
+        completion_tokens = response_tokens(models_usage, "completion_tokens")
+        self.usage.record_chat(prompt_tokens, completion_tokens)
+        prepared.usage.prompt_tokens += prompt_tokens
+        prepared.usage.completion_tokens += completion_tokens
+        
+        return self.usage.record_question(question, prepared.usage)
+    
+    async def ask_question(
+        self,
+        question: str,
+        top_k: int = 5,
+        agent: Optional[AssistantAgent] = None
+    ) -> str:
+        """
+        Ask the HR assistant a question using RAG (Retrieval-Augmented Generation).
+        
+        This method implements the complete RAG pipeline:
+        1. Convert question to embedding vector
+        2. Search vector database for relevant document chunks
+        3. Build context from retrieved chunks
+        4. Send context + question to AutoGen agent
+        5. Return generated answer
+        
+        Args:
+            question: Employee's question about HR policies
+            top_k: Number of most relevant documents to retrieve (default: 5)
+            agent: Conversation from `create_session` (default: the team's own)
+            
+        Returns:
+            Assistant's answer based on retrieved context
+        """
+        agent = agent or self.hr_assistant
+        started = time.perf_counter()
+        prepared = await self._prepare_question(question, top_k, agent)
+        if prepared.cached_answer is not None:
+            METRICS.observe("ask.total", time.perf_counter() - started)
+            print(format_question_usage(self._record_usage(question, prepared)))
+            self._print_answer(prepared.cached_answer)
+            return prepared.cached_answer
+        
         # Step 5: Send to AutoGen agent and get response (using 0.7.5 async API)
         print(f"💬 Generating answer using AutoGen agent...\n")
         
         cancellation_token = CancellationToken()
-        response = await self.hr_assistant.on_messages(
-            [TextMessage(content=augmented_message, source="user")],
-            cancellation_token
-        )
+        with METRICS.timer("ask.llm"):
+            response = await agent.on_messages(
+                [TextMessage(content=prepared.prompt, source="user")],
+                cancellation_token
+            )
+        METRICS.observe("ask.total", time.perf_counter() - started)
         
         # Extract the text answer from the agent's response
         answer = response.chat_message.content
+        self._remember_answer(question, top_k, prepared, answer)
+        usage_entry = self._record_usage(question, prepared, response.chat_message.models_usage)
+        print(format_question_usage(usage_entry))
         
-        print(f"{'='*60}")
-        print(f"ANSWER:\n{answer}")
-        print(f"{'='*60}\n")
+        self._print_answer(answer)
         
         return answer
     
+    async def ask_question_stream(
+        self,
+        question: str,
+        top_k: int = 5,
+        on_usage: Optional[Callable[[Dict[str, Any]], None]] = None,
+        agent: Optional[AssistantAgent] = None
+    ) -> AsyncIterator[str]:
+        """
+        Ask a question like `ask_question`, yielding the answer as it is generated.
+        
+        Retrieval runs first; then answer tokens are yielded as soon as the
+        model produces them, so callers can show the beginning of the answer
+        long before generation finishes. Cached answers are yielded in one piece.
+        
+        Args:
+            question: Employee's question about HR policies
+            top_k: Number of most relevant documents to retrieve (default: 5)
+            on_usage: Optional callback receiving the question's token usage
+                entry once the answer is complete
+            agent: Conversation from `create_session` (default: the team's own)
+            
+        Yields:
+            Pieces of the answer text, in order
+        """
+        agent = agent or self.hr_assistant
+        started = time.perf_counter()
+        prepared = await self._prepare_question(question, top_k, agent)
+        if prepared.cached_answer is not None:
+            METRICS.observe("ask.total", time.perf_counter() - started)
+            usage_entry = self._record_usage(question, prepared)
+            if on_usage:
+                on_usage(usage_entry)
+            yield prepared.cached_answer
+            return
+        
+        print(f"💬 Generating answer using AutoGen agent...\n")
+        
+        cancellation_token = CancellationToken()
+        answer = None
+        models_usage = None
+        streamed = False
+        llm_started = time.perf_counter()
+        
+        async for event in agent.on_messages_stream(
+            [TextMessage(content=prepared.prompt, source="user")],
+            cancellation_token
+        ):
+            if isinstance(event, ModelClientStreamingChunkEvent):
+                if not streamed:
+                    METRICS.observe("ask.llm_first_token", time.perf_counter() - llm_started)
+                streamed = True
+                yield event.content
+            elif isinstance(event, Response):
+                answer = event.chat_message.content
+                models_usage = event.chat_message.models_usage
+        
+        # Includes time the consumer spent handling yielded tokens
+        METRICS.observe("ask.llm", time.perf_counter() - llm_started)
+        METRICS.observe("ask.total", time.perf_counter() - started)
+        
+        if answer is None:
+            return
+        
+        self._remember_answer(question, top_k, prepared, answer)
+        usage_entry = self._record_usage(question, prepared, models_usage)
+        if on_usage:
+            on_usage(usage_entry)
+        
+        # Model clients that cannot stream only deliver the final response
+        if not streamed:
+            yield answer
+    
+    async def print_answer_stream(self, question: str, top_k: int = 5) -> str:
+        """
+        Ask a question and print the answer incrementally as it streams in.
+        
+        Args:
+            question: Employee's question about HR policies
+            top_k: Number of most relevant documents to retrieve (default: 5)
+            
+        Returns:
+            The complete answer
+        """
+        parts = []
+        usage_entries = []
+        header_printed = False
+        
+        async for token in self.ask_question_stream(question, top_k, on_usage=usage_entries.append):
+            if not header_printed:
+                print(f"{'='*60}")
+                print("ANSWER:")
+                header_printed = True
+            print(token, end="", flush=True)
+            parts.append(token)
+        
+        if header_printed:
+            print(f"\n{'='*60}")
+        for entry in usage_entries:
+            print(format_question_usage(entry))
+        print()
+        return "".join(parts)
+    
     async def close(self):
-        """Close model client connection."""
+        """Close model client connection and persist the answer cache."""
+        if self.answer_cache is not None:
+            self.answer_cache.save()
         await self.model_client.close()
@@ -0,0 +1,144 @@
+"""
+Semantic answer cache keyed by question embeddings.
+
+Complements the exact-match AnswerCache: a new question whose embedding is
+within a cosine-similarity threshold of a cached question is answered with
+the cached answer, skipping vector search and generation. All cached
+question embeddings live in one contiguous, L2-normalized float32 matrix, so
+a probe is a single matrix-vector product.
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class SemanticAnswerCache:
+    """
+    In-memory nearest-question cache.
+    
+    Entries from an older knowledge-base generation are dropped as soon as a
+    newer generation is seen. Once `max_entries` is reached, the oldest
+    entries are overwritten first.
+    """
+    
+    def __init__(
+        self,
+        dimensions: int,
+        max_entries: int = 10000,
+        threshold: float = 0.97
+    ):
+        """
+        Create an empty cache.
+        
+        Args:
+            dimensions: Question embedding dimensions
+            max_entries: Maximum cached questions
+            threshold: Minimum cosine similarity for a cached answer to be served
+        """
+        self.dimensions = dimensions
+        self.max_entries = max(1, max_entries)
+        self.threshold = threshold
+        self.generation: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        
+        # Grown on demand up to max_entries rows
+        self._vectors = np.zeros((min(self.max_entries, 1024), dimensions), dtype=np.float32)
+        self._top_ks = np.zeros(len(self._vectors), dtype=np.int32)
+        self._answers: List[Optional[str]] = [None] * len(self._vectors)
+        self._size = 0
+        self._next = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def clear(self):
+        """Drop all entries."""
+        self._answers = [None] * len(self._vectors)
+        self._size = 0
+        self._next = 0
+    
+    def _normalize(self, embedding: List[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.shape != (self.dimensions,):
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+    
+    def _check_generation(self, generation: str):
+        if generation != self.generation:
+            self.clear()
+            self.generation = generation
+    
+    def get(
+        self,
+        embedding: List[float],
+        top_k: int,
+        generation: str
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Find the cached answer of the most similar previous question.
+        
+        Args:
+            embedding: Embedding of the new question
+            top_k: Number of documents the answer should be based on
+            generation: Current knowledge-base generation ID
+        
+        Returns:
+            (answer, cosine similarity) if a cached question is similar
+            enough, otherwise None
+        """
+        self._check_generation(generation)
+        query = self._normalize(embedding)
+        if query is None or self._size == 0:
+            self.misses += 1
+            return None
+        
+        scores = self._vectors[:self._size] @ query
+        scores[self._top_ks[:self._size] != top_k] = -1.0
+        best = int(np.argmax(scores))
+        
+        if scores[best] < self.threshold:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return self._answers[best], float(scores[best])
+    
+    def put(
+        self,
+        embedding: List[float],
+        top_k: int,
+        generation: str,
+        answer: str
+    ) -> None:
+        """
+        Cache the answer to a question.
+        
+        Args:
+            embedding: Embedding of the question
+            top_k: Number of documents the answer was generated from
+            generation: Knowledge-base generation ID the answer was generated from
+            answer: Generated answer
+        """
+        self._check_generation(generation)
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        
+        if self._next == len(self._vectors) and len(self._vectors) < self.max_entries:
+            capacity = min(self.max_entries, len(self._vectors) * 2)
+            grown = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            grown[:len(self._vectors)] = self._vectors
+            self._vectors = grown
+            self._top_ks = np.concatenate(
+                [self._top_ks, np.zeros(capacity - len(self._top_ks), dtype=np.int32)]
+            )
+            self._answers.extend([None] * (capacity - len(self._answers)))
+        
+        slot = self._next % self.max_entries
+        self._vectors[slot] = vector
+        self._top_ks[slot] = top_k
+        self._answers[slot] = answer
+        self._next = slot + 1
+        self._size = max(self._size, self._next)
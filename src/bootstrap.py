@@ -0,0 +1,151 @@
+"""
+Concurrent start-up of the HR assistant.
+
+Building the assistant touches three remote services: the Azure OpenAI
+embeddings endpoint, the chat endpoint and Cosmos DB. Done one after another, start-up takes
+the sum of those round trips; `bootstrap_hr_team` runs them concurrently
+and pre-opens each connection, so it takes about as long as the slowest.
+
+Entry points pass their `config.settings` module in.
+"""
+import time
+import asyncio
+from types import ModuleType
+from typing import TYPE_CHECKING, Optional
+
+from .processors.pdf_processor import PDFProcessor
+from .agents.hr_agents import HRAssistantTeam, create_model_client, warm_up_model_client
+from .agents.answer_cache import AnswerCache
+from .monitoring.usage import UsageTracker
+
+if TYPE_CHECKING:
+    from .vector_db.vector_db.vector_store import VectorStore
+
+
+async def _open_store(settings: ModuleType, async_store: bool) -> "VectorStore":
+    """Open the configured vector store without blocking the event loop."""
+    from .vector_db.vector_db.vector_store import LOCAL_BACKENDS, open_local_store
+    if settings.VECTOR_STORE_BACKEND in LOCAL_BACKENDS:
+        return await asyncio.to_thread(open_local_store, settings)
+    
+    options = dict(
+        connection_string=settings.COSMOS_CONNECTION_STRING,
+        database_name=settings.COSMOS_DATABASE_NAME,
+        collection_name=settings.COSMOS_COLLECTION_NAME,
+        embedding_dimensions=settings.EMBEDDING_DIMENSIONS,
+        vector_index_type=settings.VECTOR_INDEX_TYPE
+    )
+    # Imported on use, so Motor only loads for the async store
+    if async_store:
+        from .vector_db.vector_db.async_cosmos_vector_db import AsyncCosmosVectorDB
+        return await AsyncCosmosVectorDB.create(**options)
+    
+    from .vector_db.vector_db.cosmos_vector_db import CosmosVectorDB
+    # Queries never manage the index, so skip the index check; the
+    # constructor still pings, so run it in a thread
+    return await asyncio.to_thread(CosmosVectorDB, read_only=True, **options)
+
+
+def _load_answer_cache(settings: ModuleType) -> Optional[AnswerCache]:
+    if not settings.ANSWER_CACHE_ENABLED:
+        return None
+    return AnswerCache(
+        max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+        path=settings.ANSWER_CACHE_PATH or None
+    )
+
+
+async def bootstrap_hr_team(
+    settings: ModuleType,
+    async_store: bool = False,
+    memory_mode: Optional[str] = None,
+    warm_up: bool = True
+) -> HRAssistantTeam:
+    """
+    Create a ready-to-use HRAssistantTeam, initializing dependencies concurrently.
+    
+    Args:
+        settings: The `config.settings` module
+        async_store: Use AsyncCosmosVectorDB instead of a read-only
+            CosmosVectorDB (ignored by the local backends)
+        memory_mode: Conversation memory policy (default: settings.AGENT_MEMORY_MODE)
+        warm_up: Pre-open the HTTPS connections to both Azure OpenAI clients.
+            Idle connections are dropped after a few seconds, so this helps
+            callers that ask right away (main.py, servers) most
+    
+    Returns:
+        HRAssistantTeam; release it with `shutdown_hr_team`
+    """
+    started = time.perf_counter()
+    
+    usage_tracker = UsageTracker(
+        prompt_cost_per_1k=settings.CHAT_PROMPT_COST_PER_1K,
+        completion_cost_per_1k=settings.CHAT_COMPLETION_COST_PER_1K,
+        embedding_cost_per_1k=settings.EMBEDDING_COST_PER_1K
+    )
+    
+    # Client objects are cheap to create; connections open on first use
+    pdf_processor = PDFProcessor(
+        azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
+        azure_api_key=settings.AZURE_OPENAI_KEY,
+        api_version=settings.AZURE_OPENAI_API_VERSION,
+        embedding_model=settings.EMBEDDING_MODEL_DEPLOYMENT,
+        usage_tracker=usage_tracker,
+        embedding_dimensions=settings.EMBEDDING_DIMENSIONS if settings.EMBEDDING_REQUEST_DIMENSIONS else None
+    )
+    model_client = create_model_client(
+        azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
+        azure_deployment=settings.CHAT_MODEL_DEPLOYMENT,
+        api_key=settings.AZURE_OPENAI_KEY,
+        api_version=settings.AZURE_OPENAI_API_VERSION
+    )
+    
+    warm_ups = [pdf_processor.warm_up(), warm_up_model_client(model_client)] if warm_up else []
+    try:
+        cosmos_db, answer_cache, *_ = await asyncio.gather(
+            _open_store(settings, async_store),
+            asyncio.to_thread(_load_answer_cache, settings),
+            *warm_ups
+        )
+    except BaseException:
+        await pdf_processor.aclose()
+        await model_client.close()
+        raise
+    
+    semantic_cache = None
+    if settings.SEMANTIC_CACHE_ENABLED:
+        from .agents.semantic_cache import SemanticAnswerCache  # Loads NumPy
+        semantic_cache = SemanticAnswerCache(
+            dimensions=settings.EMBEDDING_DIMENSIONS,
+            max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD
+        )
+    
+    hr_team = HRAssistantTeam(
+        cosmos_db=cosmos_db,
+        pdf_processor=pdf_processor,
+        azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
+        azure_deployment=settings.CHAT_MODEL_DEPLOYMENT,
+        api_key=settings.AZURE_OPENAI_KEY,
+        api_version=settings.AZURE_OPENAI_API_VERSION,
+        memory_mode=memory_mode or settings.AGENT_MEMORY_MODE,
+        memory_turns=settings.AGENT_MEMORY_TURNS,
+        context_token_budget=settings.CONTEXT_TOKEN_BUDGET,
+        chunk_overlap=settings.CHUNK_OVERLAP,
+        answer_cache=answer_cache,
+        semantic_cache=semantic_cache,
+        generation_refresh_seconds=settings.KB_GENERATION_REFRESH_SECONDS,
+        usage_tracker=usage_tracker,
+        model_client=model_client
+    )
+    
+    print(f"✓ HR assistant initialized in {time.perf_counter() - started:.2f}s")
+    return hr_team
+
+
+async def shutdown_hr_team(hr_team: HRAssistantTeam) -> None:
+    """Close the team, its Azure clients and its vector store."""
+    await hr_team.close()
+    await hr_team.pdf_processor.aclose()
+    hr_team.cosmos_db.close()
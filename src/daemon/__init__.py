@@ -0,0 +1 @@
+# Daemon package
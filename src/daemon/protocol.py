@@ -0,0 +1,135 @@
+"""
+Wire protocol and client for the HR assistant daemon.
+
+The daemon listens on a Unix socket. A client sends one JSON line per
+connection and reads JSON lines back until a final message:
+    
+    -> {"question": "...", "top_k": 5, "timings": false}
+    <- {"token": "..."}                      (zero or more, answer pieces)
+    <- {"done": true, "usage": {...}, "timings": "..."}
+    <- {"error": "..."}                      (instead of "done" on failure)
+
+Control requests use {"command": "status"} or {"command": "shutdown"}.
+
+This module only uses the standard library so `main.py` can talk to a
+running daemon without importing AutoGen, OpenAI or PyMongo.
+"""
+import json
+import asyncio
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+# Largest single protocol line (answers are sent in pieces well below this)
+MAX_LINE_BYTES = 1024 * 1024
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening on the socket."""
+
+
+class DaemonTimeout(DaemonUnavailable):
+    """The daemon did not start answering in time."""
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Serialize a protocol message as one line."""
+    return json.dumps(message).encode("utf-8") + b"\n"
+
+
+def decode_message(line: bytes) -> Dict[str, Any]:
+    """Parse one protocol line."""
+    message = json.loads(line.decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("Protocol messages must be JSON objects")
+    return message
+
+
+async def _open(socket_path: Path):
+    try:
+        return await asyncio.open_unix_connection(str(socket_path), limit=MAX_LINE_BYTES)
+    except OSError as e:
+        # Missing socket, stale socket file, unusable path...
+        raise DaemonUnavailable(str(e)) from e
+
+
+async def send_command(socket_path: Path, command: str) -> Dict[str, Any]:
+    """
+    Send a control command ('status' or 'shutdown') to the daemon.
+    
+    Raises:
+        DaemonUnavailable: If no daemon is listening
+    """
+    reader, writer = await _open(socket_path)
+    try:
+        writer.write(encode_message({"command": command}))
+        await writer.drain()
+        line = await reader.readline()
+        return decode_message(line) if line else {}
+    finally:
+        writer.close()
+
+
+async def ask_daemon(
+    socket_path: Path,
+    question: str,
+    top_k: int = 5,
+    on_token: Optional[Callable[[str], None]] = None,
+    timings: bool = False,
+    first_message_timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Ask the daemon a question.
+    
+    Args:
+        socket_path: Daemon socket
+        question: Employee's question
+        top_k: Number of documents to retrieve
+        on_token: Called with each answer piece as it arrives
+        timings: Also return the daemon's stage timing report
+        first_message_timeout: Seconds to wait for the connection and the
+            first reply message (None = no limit). Once the daemon has
+            started answering, the rest of the stream is not limited
+    
+    Returns:
+        The final message with the full 'answer' added
+    
+    Raises:
+        DaemonUnavailable: If no daemon is listening
+        DaemonTimeout: If the daemon sent nothing within `first_message_timeout`
+        RuntimeError: If the daemon reports an error or hangs up early
+    """
+    async def start():
+        reader, writer = await _open(socket_path)
+        try:
+            writer.write(encode_message({"question": question, "top_k": top_k, "timings": timings}))
+            await writer.drain()
+            return reader, writer, await reader.readline()
+        except BaseException:
+            writer.close()
+            raise
+    
+    try:
+        reader, writer, line = await asyncio.wait_for(start(), first_message_timeout)
+    except asyncio.TimeoutError as e:
+        raise DaemonTimeout(f"no reply within {first_message_timeout:g}s") from e
+    
+    parts = []
+    try:
+        while True:
+            if not line:
+                raise RuntimeError("HR assistant daemon closed the connection")
+            message = decode_message(line)
+            
+            if "token" in message:
+                parts.append(message["token"])
+                if on_token:
+                    on_token(message["token"])
+            elif "error" in message:
+                raise RuntimeError(message["error"])
+            elif message.get("done"):
+                return {**message, "answer": "".join(parts)}
+            
+            line = await reader.readline()
+    finally:
+        writer.close()
@@ -0,0 +1,142 @@
+"""
+Unix-socket server keeping a warm HRAssistantTeam between questions.
+
+Every `python main.py "question"` otherwise imports AutoGen, creates the
+Azure clients and connects to Cosmos DB before it can answer. The daemon
+does that once; `main.py` forwards questions to it (see protocol.py).
+"""
+import os
+import socket
+import asyncio
+from pathlib import Path
+
+from ..agents.hr_agents import HRAssistantTeam
+from ..monitoring.latency import METRICS
+from .protocol import DaemonUnavailable, decode_message, encode_message, send_command, MAX_LINE_BYTES
+
+
+class HRAssistantDaemon:
+    """
+    Serves questions from a shared team over a Unix socket.
+    
+    Each connection gets its own conversation (`create_session`); at most
+    `max_concurrency` questions are answered at once.
+    """
+    
+    def __init__(self, hr_team: HRAssistantTeam, socket_path: Path, max_concurrency: int = 8):
+        """
+        Args:
+            hr_team: Initialized HR assistant team to answer with
+            socket_path: Unix socket to listen on
+            max_concurrency: Questions answered at once
+        """
+        self.hr_team = hr_team
+        self.socket_path = Path(socket_path)
+        self.limiter = asyncio.Semaphore(max(1, max_concurrency))
+        self._stopped = asyncio.Event()
+    
+    async def _claim_socket(self):
+        """Remove a stale socket file, refusing to replace a live daemon."""
+        if not self.socket_path.exists():
+            return
+        try:
+            await send_command(self.socket_path, "status")
+        except (DaemonUnavailable, OSError, ValueError):
+            self.socket_path.unlink()
+            return
+        raise RuntimeError(f"An HR assistant daemon is already running on {self.socket_path}")
+    
+    async def _answer(self, request: dict, writer: asyncio.StreamWriter):
+        question = request.get("question")
+        top_k = request.get("top_k", 5)
+        if not isinstance(question, str) or not question.strip():
+            writer.write(encode_message({"error": "'question' must be a non-empty string"}))
+            return
+        if not isinstance(top_k, int) or top_k < 1:
+            writer.write(encode_message({"error": "'top_k' must be a positive integer"}))
+            return
+        
+        usage_entries = []
+        async with self.limiter:
+            async for token in self.hr_team.ask_question_stream(
+                question.strip(),
+                top_k,
+                on_usage=usage_entries.append,
+                agent=self.hr_team.create_session()
+            ):
+                writer.write(encode_message({"token": token}))
+                await writer.drain()
+        
+        writer.write(encode_message({
+            "done": True,
+            "usage": usage_entries[0] if usage_entries else None,
+            "timings": METRICS.format_report() if request.get("timings") else None,
+        }))
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            request = decode_message(line)
+            
+            command = request.get("command")
+            if command == "status":
+                writer.write(encode_message({"status": "ok", "pid": os.getpid()}))
+            elif command == "shutdown":
+                writer.write(encode_message({"status": "stopping"}))
+                self._stopped.set()
+            elif command is not None:
+                writer.write(encode_message({"error": f"Unknown command '{command}'"}))
+            else:
+                await self._answer(request, writer)
+            await writer.drain()
+        
+        except (ConnectionResetError, BrokenPipeError):
+            pass  # Client went away
+        except Exception as e:
+            print(f"❌ Error processing request: {e}")
+            try:
+                writer.write(encode_message({"error": str(e)}))
+                await writer.drain()
+            except (ConnectionResetError, BrokenPipeError):
+                pass
+        finally:
+            writer.close()
+    
+    def _bind_socket(self) -> socket.socket:
+        """
+        Create the listening socket, accessible to the owning user only.
+        
+        The socket file is created with the umask in effect at bind time,
+        so it is bound under a 077 umask rather than chmod-ed afterwards,
+        which would leave a window where other users could connect. Binding
+        is synchronous, so no other task runs while the umask is changed.
+        """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        previous_umask = os.umask(0o077)
+        try:
+            sock.bind(str(self.socket_path))
+        except BaseException:
+            sock.close()
+            raise
+        finally:
+            os.umask(previous_umask)
+        return sock
+    
+    async def serve(self):
+        """Listen until a shutdown command arrives or the task is cancelled."""
+        await self._claim_socket()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        server = await asyncio.start_unix_server(
+            self._handle_connection, sock=self._bind_socket(), limit=MAX_LINE_BYTES
+        )
+        print(f"✅ HR assistant daemon listening on {self.socket_path} (pid {os.getpid()})")
+        
+        try:
+            async with server:
+                await self._stopped.wait()
+        finally:
+            if self.socket_path.exists():
+                self.socket_path.unlink()
@@ -0,0 +1,168 @@
+"""
+In-process latency histograms for the RAG pipeline.
+
+Each pipeline stage records its duration under a name ("ask.search",
+"cosmos.search", ...). `METRICS` is the process-wide registry: wrap a stage
+in `METRICS.timer(name)` to record it, and call `METRICS.snapshot()` for
+count, mean and p50/p95/p99 per stage, or `METRICS.format_report()` for a
+printable table.
+"""
+import time
+import math
+import inspect
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List
+
+
+class LatencyHistogram:
+    """
+    Latency samples of one stage.
+    
+    The most recent `max_samples` durations are kept for percentiles; count,
+    total and max cover every observation.
+    """
+    
+    def __init__(self, max_samples: int = 10000):
+        self.samples: Deque[float] = deque(maxlen=max(1, max_samples))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def observe(self, seconds: float) -> None:
+        """Record one duration in seconds."""
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+    
+    @staticmethod
+    def _percentile(ordered: List[float], percent: float) -> float:
+        """Nearest-rank percentile of pre-sorted samples."""
+        rank = max(1, math.ceil(percent / 100 * len(ordered)))
+        return ordered[rank - 1]
+    
+    def summary(self) -> Dict[str, float]:
+        """
+        Summarize the recorded durations.
+        
+        Returns:
+            count plus mean/p50/p95/p99/max in milliseconds
+        """
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0,
+                    "p99_ms": 0.0, "max_ms": 0.0}
+        
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000,
+            "p50_ms": self._percentile(ordered, 50) * 1000,
+            "p95_ms": self._percentile(ordered, 95) * 1000,
+            "p99_ms": self._percentile(ordered, 99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class MetricsRegistry:
+    """
+    Named latency histograms, safe to update from several threads.
+    """
+    
+    def __init__(self, max_samples: int = 10000):
+        """
+        Args:
+            max_samples: Recent samples kept per stage for percentiles
+        """
+        self.max_samples = max_samples
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration for a stage."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram(self.max_samples)
+            histogram.observe(seconds)
+    
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block and record it under `name`.
+        
+        Works inside coroutines too: the duration includes time spent
+        awaiting, which is what the caller waits for.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+    
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return a summary per stage (see LatencyHistogram.summary).
+        
+        Returns:
+            {stage name: {"count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"}}
+        """
+        with self._lock:
+            return {
+                name: histogram.summary()
+                for name, histogram in sorted(self._histograms.items())
+            }
+    
+    def reset(self) -> None:
+        """Drop all recorded samples."""
+        with self._lock:
+            self._histograms.clear()
+    
+    def format_report(self) -> str:
+        """Format the snapshot as a text table."""
+        snapshot = self.snapshot()
+        if not snapshot:
+            return "No timings recorded"
+        
+        width = max(len("stage"), *(len(name) for name in snapshot))
+        lines = [
+            f"{'stage':<{width}}  {'count':>6}  {'mean':>9}  {'p50':>9}  "
+            f"{'p95':>9}  {'p99':>9}  {'max':>9}"
+        ]
+        for name, stats in snapshot.items():
+            lines.append(
+                f"{name:<{width}}  {stats['count']:>6}  "
+                + "  ".join(
+                    f"{stats[key]:>7.1f}ms"
+                    for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+                )
+            )
+        return "\n".join(lines)
+
+
+# Process-wide registry used by the pipeline components
+METRICS = MetricsRegistry()
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorator recording every call of a function or coroutine function
+    under `name` in METRICS.
+    """
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with METRICS.timer(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with METRICS.timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    
+    return decorator
@@ -0,0 +1,154 @@
+"""
+Token usage and cost accounting.
+
+Components report the token counts Azure OpenAI returns with each response
+to a UsageTracker: PDFProcessor records embedding tokens, HRAssistantTeam
+records chat prompt/completion tokens and one entry per question. The
+tracker keeps run/session totals and converts them to an approximate cost
+using per-1K-token prices from the configuration.
+"""
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+class TokenUsage:
+    """
+    Token counts of one unit of work (a question, a request, a run).
+    """
+    
+    def __init__(
+        self,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        embedding_tokens: int = 0
+    ):
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.embedding_tokens = embedding_tokens
+    
+    def add(self, other: "TokenUsage") -> None:
+        """Add another usage's counts to this one."""
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.embedding_tokens += other.embedding_tokens
+    
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "embedding_tokens": self.embedding_tokens,
+        }
+
+
+def response_tokens(usage: Any, field: str) -> int:
+    """
+    Read a token count from an API usage object, tolerating missing usage.
+    
+    Args:
+        usage: `response.usage` (OpenAI) or `models_usage` (AutoGen), or None
+        field: Attribute name, e.g. 'total_tokens' or 'prompt_tokens'
+    """
+    return int(getattr(usage, field, 0) or 0) if usage is not None else 0
+
+
+class UsageTracker:
+    """
+    Thread-safe accumulator of token usage with cost estimation.
+    """
+    
+    def __init__(
+        self,
+        prompt_cost_per_1k: float = 0.0,
+        completion_cost_per_1k: float = 0.0,
+        embedding_cost_per_1k: float = 0.0,
+        max_questions: int = 1000
+    ):
+        """
+        Args:
+            prompt_cost_per_1k: Price per 1K chat prompt tokens
+            completion_cost_per_1k: Price per 1K chat completion tokens
+            embedding_cost_per_1k: Price per 1K embedding tokens
+            max_questions: Most recent per-question entries kept
+        """
+        self.prompt_cost_per_1k = prompt_cost_per_1k
+        self.completion_cost_per_1k = completion_cost_per_1k
+        self.embedding_cost_per_1k = embedding_cost_per_1k
+        self.totals = TokenUsage()
+        self.question_count = 0
+        self.questions: Deque[Dict[str, Any]] = deque(maxlen=max(1, max_questions))
+        self._lock = threading.Lock()
+    
+    def cost(self, usage: TokenUsage) -> float:
+        """Approximate cost of a usage at the configured prices."""
+        return (
+            usage.prompt_tokens * self.prompt_cost_per_1k
+            + usage.completion_tokens * self.completion_cost_per_1k
+            + usage.embedding_tokens * self.embedding_cost_per_1k
+        ) / 1000
+    
+    def record_embedding(self, tokens: int) -> None:
+        """Add embedding tokens to the totals."""
+        with self._lock:
+            self.totals.embedding_tokens += tokens
+    
+    def record_chat(self, prompt_tokens: int, completion_tokens: int) -> None:
+        """Add chat completion tokens to the totals."""
+        with self._lock:
+            self.totals.prompt_tokens += prompt_tokens
+            self.totals.completion_tokens += completion_tokens
+    
+    def record_question(self, question: str, usage: TokenUsage) -> Dict[str, Any]:
+        """
+        Log the usage of one answered question.
+        
+        Its tokens must already have been added to the totals through
+        `record_embedding` / `record_chat`; this only keeps the breakdown.
+        
+        Returns:
+            The logged entry (question, token counts and cost)
+        """
+        entry = {"question": question, **usage.to_dict(), "cost": self.cost(usage)}
+        with self._lock:
+            self.question_count += 1
+            self.questions.append(entry)
+        return entry
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the totals.
+        
+        Returns:
+            questions, prompt/completion/embedding token totals and cost
+        """
+        with self._lock:
+            totals = TokenUsage()
+            totals.add(self.totals)
+            questions = self.question_count
+        return {"questions": questions, **totals.to_dict(), "cost": self.cost(totals)}
+    
+    def format_report(self, title: str = "Token usage") -> str:
+        """Format the totals (and per-question average) as text."""
+        snapshot = self.snapshot()
+        lines = [
+            f"{title}:",
+            f"  Chat prompt tokens:     {snapshot['prompt_tokens']:,}",
+            f"  Chat completion tokens: {snapshot['completion_tokens']:,}",
+            f"  Embedding tokens:       {snapshot['embedding_tokens']:,}",
+            f"  Estimated cost:         ${snapshot['cost']:.4f}",
+        ]
+        if snapshot["questions"]:
+            lines.append(
+                f"  Questions:              {snapshot['questions']} "
+                f"(avg ${snapshot['cost'] / snapshot['questions']:.4f} each)"
+            )
+        return "\n".join(lines)
+
+
+def format_question_usage(entry: Dict[str, Any]) -> str:
+    """One-line summary of a `record_question` entry."""
+    return (
+        f"🧾 Tokens: {entry['prompt_tokens']} prompt, "
+        f"{entry['completion_tokens']} completion, "
+        f"{entry['embedding_tokens']} embedding (~${entry['cost']:.4f})"
+    )
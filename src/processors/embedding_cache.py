@@ -0,0 +1,127 @@
+"""
+Persistent, content-addressed embedding cache.
+
+Embeddings are stored in a local SQLite database keyed by
+(embedding model, dimensions, SHA-256 of the chunk text), with each vector
+packed as float32 bytes. Re-ingesting unchanged text then costs a local
+lookup instead of an Azure OpenAI request.
+"""
+import hashlib
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import List, Dict, Optional
+
+
+class EmbeddingCache:
+    """
+    On-disk cache of embedding vectors.
+
+    Safe to share between threads; all access goes through one connection
+    guarded by a lock.
+    """
+
+    def __init__(self, path: str, model: str, dimensions: int):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file path (parent directories are created)
+            model: Embedding model deployment name
+            dimensions: Embedding vector dimensions
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = str(path)
+        self.model = model
+        self.dimensions = dimensions
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                dimensions INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, dimensions, text_hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        """Return the content hash used as cache key."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: List[str]) -> Dict[int, List[float]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Mapping of index into `texts` to embedding, for cache hits only
+        """
+        if not texts:
+            return {}
+
+        hashes = [self._hash(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        unique = list(set(hashes))
+
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                part = unique[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND dimensions = ? "
+                    f"AND text_hash IN ({','.join('?' * len(part))})",
+                    [self.model, self.dimensions, *part]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = array("f", blob).tolist()
+
+        return {i: found[h] for i, h in enumerate(hashes) if h in found}
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Return the cached embedding for one text, or None."""
+        return self.get_many([text]).get(0)
+
+    def put_many(self, texts: List[str], embeddings: List[List[float]]) -> None:
+        """
+        Store embeddings. Empty embeddings (failed requests) are skipped.
+
+        Args:
+            texts: Texts that were embedded
+            embeddings: Embedding for each text
+        """
+        rows = [
+            (self.model, self.dimensions, self._hash(text), array("f", embedding).tobytes())
+            for text, embedding in zip(texts, embeddings)
+            if embedding
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings "
+                "(model, dimensions, text_hash, vector) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def put(self, text: str, embedding: List[float]) -> None:
+        """Store the embedding for one text."""
+        self.put_many([text], [embedding])
+
+    def close(self):
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
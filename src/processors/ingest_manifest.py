@@ -0,0 +1,169 @@
+"""
+Ingestion manifest for incremental document embedding.
+
+Records, for every ingested PDF, its size, modification time, content hash,
+the chunking/embedding settings it was ingested with and the IDs of the chunks
+it produced. `embed_documents.py` uses it to skip
+unchanged files and to remove chunks left behind by changed or deleted files.
+"""
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional
+
+
+def file_sha256(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestManifest:
+    """
+    JSON-backed record of what has been ingested into one vector store.
+    
+    The file holds a section per target (backend plus collection or store
+    path), so switching VECTOR_STORE_BACKEND does not skip files that were
+    only ingested into the other store. Entries are keyed by resolved file
+    path:
+    {
+        "size": 12345,
+        "mtime": 1700000000.0,
+        "sha256": "...",
+        "fingerprint": {"chunk_size": 1000, ...},
+        "chunk_ids": ["doc_...", ...]
+    }
+    """
+    
+    def __init__(
+        self,
+        path: Path,
+        fingerprint: Optional[Dict[str, Any]] = None,
+        target: str = "default"
+    ):
+        """
+        Load the manifest, starting empty if the file does not exist.
+        
+        Args:
+            path: Manifest JSON file path
+            fingerprint: Settings that determine the stored chunks (chunk size,
+                overlap, embedding model and dimensions); files ingested with
+                a different fingerprint count as changed
+            target: Vector store the entries describe (see `vector_store_target`)
+        """
+        self.path = Path(path)
+        self.fingerprint = dict(fingerprint or {})
+        self.targets: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    # Version 1 manifests did not record their target; their
+                    # files are reprocessed once
+                    self.targets = json.load(file).get("targets", {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable ingest manifest {self.path}: {e}")
+        
+        self.entries = self.targets.setdefault(target, {})
+    
+    @staticmethod
+    def _key(pdf_file: Path) -> str:
+        return str(Path(pdf_file).resolve())
+    
+    def has_changed(self, pdf_file: Path) -> bool:
+        """
+        Check whether a file needs (re)processing.
+        
+        Size and mtime are compared first; the content hash is only computed
+        when they differ, so touched-but-identical files are still skipped.
+        
+        Args:
+            pdf_file: PDF file path
+        
+        Returns:
+            True if the file is new, its content changed or it was ingested
+            with different settings
+        """
+        entry = self.entries.get(self._key(pdf_file))
+        if entry is None or entry.get("fingerprint") != self.fingerprint:
+            return True
+        
+        stat = Path(pdf_file).stat()
+        if stat.st_size == entry["size"] and stat.st_mtime == entry["mtime"]:
+            return False
+        if stat.st_size == entry["size"] and file_sha256(pdf_file) == entry["sha256"]:
+            entry["mtime"] = stat.st_mtime
+            return False
+        return True
+    
+    def record(self, pdf_file: Path, chunk_ids: List[str]) -> List[str]:
+        """
+        Record a successfully ingested file.
+        
+        Args:
+            pdf_file: PDF file path
+            chunk_ids: IDs of the chunks stored for this file
+        
+        Returns:
+            Chunk IDs previously recorded for the file that are no longer produced
+        """
+        key = self._key(pdf_file)
+        previous = self.entries.get(key, {}).get("chunk_ids", [])
+        stat = Path(pdf_file).stat()
+        
+        self.entries[key] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": file_sha256(pdf_file),
+            "fingerprint": self.fingerprint,
+            "chunk_ids": list(chunk_ids),
+        }
+        
+        current = set(chunk_ids)
+        return [chunk_id for chunk_id in previous if chunk_id not in current]
+    
+    def remove_missing(self, pdf_files: Iterable[Path]) -> List[str]:
+        """
+        Drop entries for files that no longer exist in the corpus.
+        
+        Args:
+            pdf_files: PDF files currently present
+        
+        Returns:
+            Chunk IDs that belonged to the removed files
+        """
+        present = {self._key(pdf_file) for pdf_file in pdf_files}
+        removed: List[str] = []
+        
+        for key in [key for key in self.entries if key not in present]:
+            print(f"🗑️  {Path(key).name} was removed from the corpus")
+            removed.extend(self.entries.pop(key)["chunk_ids"])
+        
+        return removed
+    
+    def unreferenced(self, chunk_ids: Iterable[str]) -> List[str]:
+        """
+        Filter out chunk IDs still produced by some recorded file.
+        
+        Chunk IDs are content hashes, so identical text in two PDFs maps to
+        the same stored chunk; it must survive until no file produces it.
+        """
+        referenced = {
+            chunk_id
+            for entry in self.entries.values()
+            for chunk_id in entry["chunk_ids"]
+        }
+        return sorted({chunk_id for chunk_id in chunk_ids if chunk_id not in referenced})
+    
+    def save(self):
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"version": 2, "targets": self.targets}, file, indent=2)
+        os.replace(tmp_path, self.path)
@@ -6,11 +6,59 @@ This module handles the document preparation phase of RAG:
 2. Split text into manageable chunks with overlap
 3. Generate embedding vectors for each chunk using Azure OpenAI
 """
+import io
 import os
-from typing import List, Dict, Any
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
-import PyPDF2
-from openai import AzureOpenAI
+from openai import AzureOpenAI, AsyncAzureOpenAI
+
+from .embedding_cache import EmbeddingCache
+from ..monitoring.latency import timed
+from ..monitoring.usage import TokenUsage, UsageTracker, response_tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimate the token count of a text (~4 characters per token).
+    
+    Used for request sizing only, so it errs on the high side instead of
+    pulling in a tokenizer dependency.
+    """
+    return len(text) // 4 + 1
+
+
+def resolve_workers(workers: int) -> int:
+    """Return a worker count, treating 0 (or less) as one per CPU core."""
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+# Last PDF parsed in this extraction worker process: (file identity, reader)
+_worker_reader: Optional[Tuple[Tuple[str, int, int], Any]] = None
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """
+    Extract the text of pages [start, stop) of a PDF.
+    
+    Module-level so it can be pickled into ProcessPoolExecutor workers.
+    Each worker keeps the last PDF it parsed, so the several slices of one
+    file it is given share a single parse.
+    """
+    global _worker_reader
+    import PyPDF2  # Only ingestion parses PDFs; keep it off the query path
+    
+    stat = os.stat(pdf_path)
+    identity = (pdf_path, stat.st_size, stat.st_mtime_ns)
+    if _worker_reader is None or _worker_reader[0] != identity:
+        with open(pdf_path, 'rb') as file:
+            # The reader parses lazily, so keep the bytes alive with it
+            _worker_reader = (identity, PyPDF2.PdfReader(io.BytesIO(file.read())))
+    
+    pdf_reader = _worker_reader[1]
+    return [pdf_reader.pages[i].extract_text() + "\n" for i in range(start, stop)]
 
 
 class PDFProcessor:
@@ -18,7 +66,7 @@ class PDFProcessor:
     Processes PDF documents into embedded chunks for vector search.
     
     Workflow:
-    1. Extract all text from PDF pages
+    1. Stream text from PDF pages
     2. Split into overlapping chunks (for context continuity)
     3. Generate 1536-dimensional embeddings for each chunk
     4. Package as documents ready for Cosmos DB storage
@@ -29,7 +77,14 @@ class PDFProcessor:
         azure_endpoint: str,
         azure_api_key: str,
         api_version: str,
-        embedding_model: str
+        embedding_model: str,
+        batch_size: int = 64,
+        max_batch_tokens: int = 32000,
+        concurrency: int = 4,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        extract_workers: int = 1,
+        usage_tracker: Optional[UsageTracker] = None,
+        embedding_dimensions: Optional[int] = None
     ):
         """
         Initialize PDF processor with Azure OpenAI client.
@@ -39,40 +94,136 @@ class PDFProcessor:
             azure_api_key: Azure OpenAI API key
             api_version: API version
             embedding_model: Embedding model deployment name
+            batch_size: Maximum number of chunks per embeddings request
+            max_batch_tokens: Maximum estimated tokens per embeddings request
+            concurrency: Default number of embeddings requests kept in flight
+                by the async path
+            embedding_cache: Optional on-disk cache consulted before calling Azure
+            extract_workers: Processes used for PDF text extraction
+                (1 = extract in this process, 0 = one per CPU core)
+            usage_tracker: Tracker the embedding token counts returned by
+                Azure are recorded to (default: a new one, see `self.usage`)
+            embedding_dimensions: Dimensions requested from the embeddings API
+                (text-embedding-3 models only; default: the model's native size)
         """
         self.client = AzureOpenAI(
             azure_endpoint=azure_endpoint,
             api_key=azure_api_key,
             api_version=api_version
         )
+        self.async_client = AsyncAzureOpenAI(
+            azure_endpoint=azure_endpoint,
+            api_key=azure_api_key,
+            api_version=api_version
+        )
         self.embedding_model = embedding_model
+        self.batch_size = max(1, batch_size)
+        self.max_batch_tokens = max(1, max_batch_tokens)
+        self.concurrency = max(1, concurrency)
+        self.embedding_cache = embedding_cache
+        self.extract_workers = resolve_workers(extract_workers)
+        # Started on first parallel extraction and reused for every PDF
+        self._extract_pool: Optional[ProcessPoolExecutor] = None
+        self._extract_pool_size = 0
+        self._extract_pool_lock = threading.Lock()
+        self.usage = usage_tracker or UsageTracker()
+        # Only sent when set: text-embedding-ada-002 rejects the parameter
+        self._dimension_options = {"dimensions": embedding_dimensions} if embedding_dimensions else {}
+    
+    async def warm_up(self) -> None:
+        """
+        Open the async client's HTTPS connection ahead of the first request.
+        
+        Lists models, which costs no tokens; failures are ignored since the
+        first real request retries anyway.
+        """
+        try:
+            await self.async_client.models.list()
+        except Exception:
+            pass
     
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    def _record_usage(self, response: Any, usage: Optional[TokenUsage] = None) -> None:
+        """Record the tokens billed for an embeddings response."""
+        tokens = response_tokens(getattr(response, "usage", None), "total_tokens")
+        self.usage.record_embedding(tokens)
+        if usage is not None:
+            usage.embedding_tokens += tokens
+    
+    def iter_pdf_pages(self, pdf_path: str, workers: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield the text of a PDF one page at a time.
+        
+        Pages are read lazily, so only the current page's text is held in
+        memory. Each page is followed by a newline, as in
+        `extract_text_from_pdf`.
+        
+        With more than one worker, the page range is split into slices that
+        are extracted in parallel by a process pool (PyPDF2 extraction is
+        CPU-bound) and yielded back in page order.
+        
+        Args:
+            pdf_path: Path to PDF file
+            workers: Extraction processes (default: self.extract_workers,
+                0 = one per CPU core)
+            
+        Yields:
+            Text of each page, in page order
+        
+        Raises:
+            OSError / PyPDF2 errors if the file cannot be read or parsed. They
+            are not swallowed: a partially read PDF must not be mistaken for
+            a short one
+        """
+        import PyPDF2  # Only ingestion parses PDFs; keep it off the query path
+        
+        workers = self.extract_workers if workers is None else resolve_workers(workers)
+        with open(pdf_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            total_pages = len(pdf_reader.pages)
+            
+            print(f"📄 Extracting text from {Path(pdf_path).name} ({total_pages} pages)...")
+            
+            if workers <= 1 or total_pages < 2:
+                for page in pdf_reader.pages:
+                    yield page.extract_text() + "\n"
+                return
+        
+        # A few slices per worker keeps cores busy when pages vary in cost
+        slice_size = max(1, -(-total_pages // (workers * 4)))
+        starts = range(0, total_pages, slice_size)
+        stops = [min(start + slice_size, total_pages) for start in starts]
+        
+        executor = self._get_extract_pool(workers)
+        # map() returns results in submission order, i.e. page order
+        for page_texts in executor.map(
+            _extract_page_range, [pdf_path] * len(starts), starts, stops
+        ):
+            yield from page_texts
+    
+    def _get_extract_pool(self, workers: int) -> ProcessPoolExecutor:
+        """Return the extraction process pool, (re)starting it for `workers`."""
+        with self._extract_pool_lock:
+            if self._extract_pool is None or self._extract_pool_size != workers:
+                if self._extract_pool is not None:
+                    self._extract_pool.shutdown()
+                self._extract_pool = ProcessPoolExecutor(max_workers=workers)
+                self._extract_pool_size = workers
+            return self._extract_pool
+    
+    def extract_text_from_pdf(self, pdf_path: str, workers: Optional[int] = None) -> str:
         """
         Extract all text from a PDF file.
         
         Args:
             pdf_path: Path to PDF file
+            workers: Extraction processes (default: self.extract_workers,
+                0 = one per CPU core)
             
         Returns:
             Extracted text as string
         """
-        text = ""
-        try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                total_pages = len(pdf_reader.pages)
-                
-                print(f"📄 Extracting text from {Path(pdf_path).name} ({total_pages} pages)...")
-                
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                
-                print(f"✓ Extracted {len(text)} characters")
-                
-        except Exception as e:
-            print(f"✗ Error extracting text: {e}")
-            
+        text = "".join(self.iter_pdf_pages(pdf_path, workers))
+        print(f"✓ Extracted {len(text)} characters")
         return text
     
     def chunk_text(
@@ -99,24 +250,82 @@ class PDFProcessor:
         Returns:
             List of overlapping text chunks
         """
-        chunks = []
-        start = 0
-        text_length = len(text)
+        chunks = list(self.iter_chunks([text], chunk_size, overlap))
+        
+        print(f"✓ Created {len(chunks)} chunks")
+        return chunks
+    
+    def iter_chunks(
+        self,
+        pages: Iterable[str],
+        chunk_size: int = 1000,
+        overlap: int = 200
+    ) -> Iterator[str]:
+        """
+        Split streamed text into overlapping chunks.
+        
+        Produces exactly the chunks `chunk_text` would produce for the
+        concatenated pages, but only buffers about one chunk plus the current
+        page, carrying the overlap across page boundaries. The first chunk is
+        available as soon as enough pages have been read to fill it.
         
-        while start < text_length:
-            end = start + chunk_size
-            chunk = text[start:end].strip()
+        Args:
+            pages: Text pieces in document order (e.g. `iter_pdf_pages`)
+            chunk_size: Maximum characters per chunk (default: 1000)
+            overlap: Characters to repeat between chunks (default: 200)
             
+        Yields:
+            Overlapping text chunks
+        """
+        step = chunk_size - overlap
+        if step <= 0:
+            raise ValueError("overlap must be smaller than chunk_size")
+        
+        # buffer[start:] is the unconsumed text; the consumed prefix is
+        # dropped once per page so a huge page is not copied on every step
+        buffer = ""
+        for page in pages:
+            buffer += page
+            start = 0
+            while len(buffer) - start >= chunk_size:
+                chunk = buffer[start:start + chunk_size].strip()
+                if chunk:
+                    yield chunk
+                # Move forward by (chunk_size - overlap) to create overlap
+                start += step
+            buffer = buffer[start:]
+        
+        # Remaining chunks are shorter than chunk_size
+        start = 0
+        while start < len(buffer):
+            chunk = buffer[start:start + chunk_size].strip()
             if chunk:
-                chunks.append(chunk)
-            
-            # Move forward by (chunk_size - overlap) to create overlap
-            start += (chunk_size - overlap)
+                yield chunk
+            start += step
+    
+    def extract_chunks(
+        self,
+        pdf_path: str,
+        chunk_size: int,
+        overlap: int
+    ) -> List[str]:
+        """
+        Stream a PDF's pages straight into the chunker.
         
+        Args:
+            pdf_path: Path to PDF file
+            chunk_size: Size of text chunks
+            overlap: Overlap between chunks
+            
+        Returns:
+            List of overlapping text chunks
+        """
+        chunks = list(self.iter_chunks(self.iter_pdf_pages(pdf_path), chunk_size, overlap))
         print(f"✓ Created {len(chunks)} chunks")
         return chunks
     
-    def generate_embedding(self, text: str) -> List[float]:
+    @timed("embedding.generate")
+    def generate_embedding(self, text: str, usage: Optional[TokenUsage] = None) -> List[float]:
         """
         Generate 1536-dimensional embedding vector using Azure OpenAI.
         
@@ -125,20 +334,259 @@ class PDFProcessor:
         
         Args:
             text: Text to convert to embedding (question or document chunk)
+            usage: Optional per-question usage the billed tokens are added to
             
         Returns:
             1536-dimensional float vector representing the text's semantic meaning
         """
+        if self.embedding_cache:
+            cached = self.embedding_cache.get(text)
+            if cached:
+                return cached
+        
         try:
             response = self.client.embeddings.create(
                 input=text,
-                model=self.embedding_model  # text-embedding-ada-002
+                model=self.embedding_model,  # text-embedding-ada-002
+                **self._dimension_options
             )
-            return response.data[0].embedding
+            self._record_usage(response, usage)
+            embedding = response.data[0].embedding
+            if self.embedding_cache:
+                self.embedding_cache.put(text, embedding)
+            return embedding
         except Exception as e:
             print(f"✗ Error generating embedding: {e}")
             return []
     
+    @timed("embedding.generate")
+    async def generate_embedding_async(
+        self,
+        text: str,
+        usage: Optional[TokenUsage] = None
+    ) -> List[float]:
+        """
+        Async variant of `generate_embedding` for use inside coroutines.
+        
+        Awaits the Azure OpenAI request instead of blocking, so other tasks
+        on the event loop keep running while the embedding is computed.
+        
+        Args:
+            text: Text to convert to embedding (question or document chunk)
+            usage: Optional per-question usage the billed tokens are added to
+            
+        Returns:
+            1536-dimensional float vector, or an empty list on error
+        """
+        if self.embedding_cache:
+            cached = self.embedding_cache.get(text)
+            if cached:
+                return cached
+        
+        try:
+            response = await self.async_client.embeddings.create(
+                input=text,
+                model=self.embedding_model,
+                **self._dimension_options
+            )
+            self._record_usage(response, usage)
+            embedding = response.data[0].embedding
+            if self.embedding_cache:
+                self.embedding_cache.put(text, embedding)
+            return embedding
+        except Exception as e:
+            print(f"✗ Error generating embedding: {e}")
+            return []
+    
+    def _iter_batches(self, texts: List[str]) -> Iterator[List[int]]:
+        """
+        Group text indices into request-sized batches.
+        
+        A batch is closed when adding the next text would exceed either
+        `batch_size` items or `max_batch_tokens` estimated tokens. A single
+        text larger than the token limit still gets a batch of its own.
+        
+        Args:
+            texts: Texts to embed
+            
+        Yields:
+            Lists of indices into `texts`, in order
+        """
+        batch: List[int] = []
+        batch_tokens = 0
+        
+        for i, text in enumerate(texts):
+            tokens = estimate_tokens(text)
+            if batch and (
+                len(batch) >= self.batch_size
+                or batch_tokens + tokens > self.max_batch_tokens
+            ):
+                yield batch
+                batch, batch_tokens = [], 0
+            batch.append(i)
+            batch_tokens += tokens
+        
+        if batch:
+            yield batch
+    
+    def _split_cached(self, texts: List[str]) -> Tuple[List[List[float]], List[int]]:
+        """
+        Fill embeddings from the cache and report which texts still need one.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            (embeddings with cache hits filled in, indices of cache misses)
+        """
+        embeddings: List[List[float]] = [[] for _ in texts]
+        cached = self.embedding_cache.get_many(texts) if self.embedding_cache else {}
+        for i, embedding in cached.items():
+            embeddings[i] = embedding
+        
+        missing = [i for i in range(len(texts)) if i not in cached]
+        if cached:
+            print(f"✓ Reused {len(cached)}/{len(texts)} cached embeddings")
+        return embeddings, missing
+    
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for many texts using batched API requests.
+        
+        Packs several texts into each `embeddings.create` call (bounded by
+        `batch_size` and `max_batch_tokens`), so a document with hundreds of
+        chunks costs a handful of round trips instead of one per chunk.
+        Texts already in the embedding cache are not sent at all.
+        
+        Args:
+            texts: Texts to convert to embeddings
+            
+        Returns:
+            One embedding per input text, in input order. Texts from a failed
+            request get an empty list, matching `generate_embedding`.
+        """
+        embeddings, missing = self._split_cached(texts)
+        pending = [texts[i] for i in missing]
+        
+        for batch in self._iter_batches(pending):
+            batch_texts = [pending[j] for j in batch]
+            try:
+                response = self.client.embeddings.create(
+                    input=batch_texts,
+                    model=self.embedding_model,
+                    **self._dimension_options
+                )
+                self._record_usage(response)
+                # Results carry an index into the request's input list
+                batch_embeddings = [[] for _ in batch]
+                for item in response.data:
+                    batch_embeddings[item.index] = item.embedding
+                for j, embedding in zip(batch, batch_embeddings):
+                    embeddings[missing[j]] = embedding
+                if self.embedding_cache:
+                    self.embedding_cache.put_many(batch_texts, batch_embeddings)
+            except Exception as e:
+                print(f"✗ Error generating embeddings for batch of {len(batch)}: {e}")
+            
+            print(f"Generated embeddings {batch[-1] + 1}/{len(pending)}...", end='\r')
+        
+        return embeddings
+    
+    async def generate_embeddings_async(
+        self,
+        texts: List[str],
+        concurrency: Optional[int] = None,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for many texts with concurrent batched requests.
+        
+        Uses the same batching and caching as `generate_embeddings`, but keeps
+        up to `concurrency` requests in flight at once through a semaphore, so
+        the network stays busy while earlier batches are still being answered.
+        
+        Args:
+            texts: Texts to convert to embeddings
+            concurrency: Maximum requests in flight (default: self.concurrency)
+            semaphore: Semaphore shared with other callers, bounding requests
+                in flight across all of them (overrides `concurrency`)
+            
+        Returns:
+            One embedding per input text, in input order. Texts from a failed
+            request get an empty list, matching `generate_embedding`.
+        """
+        embeddings, missing = self._split_cached(texts)
+        pending = [texts[i] for i in missing]
+        semaphore = semaphore or asyncio.Semaphore(max(1, concurrency or self.concurrency))
+        completed = 0
+        
+        async def embed_batch(batch: List[int]) -> None:
+            nonlocal completed
+            batch_texts = [pending[j] for j in batch]
+            async with semaphore:
+                try:
+                    response = await self.async_client.embeddings.create(
+                        input=batch_texts,
+                        model=self.embedding_model,
+                        **self._dimension_options
+                    )
+                    self._record_usage(response)
+                    batch_embeddings = [[] for _ in batch]
+                    for item in response.data:
+                        batch_embeddings[item.index] = item.embedding
+                    for j, embedding in zip(batch, batch_embeddings):
+                        embeddings[missing[j]] = embedding
+                    if self.embedding_cache:
+                        self.embedding_cache.put_many(batch_texts, batch_embeddings)
+                except Exception as e:
+                    print(f"✗ Error generating embeddings for batch of {len(batch)}: {e}")
+            
+            completed += len(batch)
+            print(f"Generated embeddings {completed}/{len(pending)}...", end='\r')
+        
+        await asyncio.gather(*(embed_batch(batch) for batch in self._iter_batches(pending)))
+        return embeddings
+    
+    def build_documents(
+        self,
+        pdf_path: str,
+        chunks: List[str],
+        embeddings: List[List[float]],
+        metadata: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Package chunks and their embeddings as documents for Cosmos DB.
+        
+        Chunks whose embedding failed (an empty list) are left out: stored
+        without a vector they could never be found by search.
+        
+        Args:
+            pdf_path: Path to the source PDF file
+            chunks: Text chunks in document order
+            embeddings: Embedding for each chunk
+            metadata: Additional metadata
+            
+        Returns:
+            List of documents with embeddings
+        """
+        documents = []
+        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
+            if not embedding:
+                continue
+            doc = {
+                "content": chunk,
+                "contentVector": embedding,
+                "metadata": {
+                    "source": os.path.basename(pdf_path),
+                    "full_path": pdf_path,
+                    "chunk_id": i,
+                    "total_chunks": len(chunks),
+                    **(metadata or {})
+                }
+            }
+            documents.append(doc)
+        return documents
+    
     def process_pdf(
         self,
         pdf_path: str,
@@ -162,33 +610,25 @@ class PDFProcessor:
         print(f"Processing: {Path(pdf_path).name}")
         print(f"{'='*60}")
         
-        # Extract text
-        text = self.extract_text_from_pdf(pdf_path)
-        if not text.strip():
+        # Extract and chunk text page by page
+        chunks = self.extract_chunks(pdf_path, chunk_size, overlap)
+        if not chunks:
             return []
         
-        # Chunk text
-        chunks = self.chunk_text(text, chunk_size, overlap)
+        # Generate embeddings in batched requests
+        embeddings = self.generate_embeddings(chunks)
         
         # Create documents with embeddings
-        documents = []
-        for i, chunk in enumerate(chunks):
-            print(f"Generating embedding {i+1}/{len(chunks)}...", end='\r')
-            
-            embedding = self.generate_embedding(chunk)
-            
-            doc = {
-                "content": chunk,
-                "contentVector": embedding,
-                "metadata": {
-                    "source": os.path.basename(pdf_path),
-                    "full_path": pdf_path,
-                    "chunk_id": i,
-                    "total_chunks": len(chunks),
-                    **(metadata or {})
-                }
-            }
-            documents.append(doc)
+        documents = self.build_documents(pdf_path, chunks, embeddings, metadata)
         
         print(f"\n✓ Created {len(documents)} documents with embeddings\n")
         return documents
+    
+    async def aclose(self):
+        """Close the async Azure OpenAI client, the embedding cache and the extraction pool."""
+        await self.async_client.close()
+        if self.embedding_cache:
+            self.embedding_cache.close()
+        if self._extract_pool is not None:
+            self._extract_pool.shutdown()
+            self._extract_pool = None
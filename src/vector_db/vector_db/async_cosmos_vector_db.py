@@ -0,0 +1,256 @@
+"""
+Async Azure Cosmos DB for MongoDB vCore vector database (Motor).
+
+Same interface as CosmosVectorDB, but every database call is a coroutine,
+so concurrent questions in one asyncio process overlap their database
+round trips instead of blocking the event loop.
+"""
+from typing import List, Dict, Any, Optional
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, ConnectionFailure
+
+from ...monitoring.latency import timed
+from .cosmos_vector_db import (
+    KB_META_COLLECTION,
+    VECTOR_INDEX_NAME,
+    build_search_pipeline,
+    build_upsert_operations,
+    collect_write_errors,
+    reject_missing_vectors,
+)
+
+
+class AsyncCosmosVectorDB:
+    """
+    Async vector database for storing and retrieving document embeddings.
+    
+    Mirrors CosmosVectorDB (insert_documents, search, delete_document,
+    delete_documents, close) with awaitable methods. The vector index is
+    managed by the synchronous CosmosVectorDB used for ingestion (see
+    ensure_index.py).
+    
+    Create instances with `await AsyncCosmosVectorDB.create(...)`, which also
+    verifies the connection.
+    """
+    
+    def __init__(
+        self,
+        connection_string: str,
+        database_name: str,
+        collection_name: str,
+        embedding_dimensions: int = 1536,
+        vector_index_type: str = "vector-hnsw",
+        write_batch_size: int = 500
+    ):
+        """
+        Set up the Motor client (no network I/O until first use).
+        
+        Args:
+            connection_string: MongoDB vCore connection string from Azure Portal
+            database_name: Name of database
+            collection_name: Name of collection holding embedded documents
+            embedding_dimensions: Vector dimensions (1536 for text-embedding-ada-002)
+            vector_index_type: Index type, kept for parity with CosmosVectorDB
+            write_batch_size: Documents per bulk write request in insert_documents
+        """
+        self.client = AsyncIOMotorClient(connection_string)
+        self.database = self.client[database_name]
+        self.collection = self.database[collection_name]
+        self.meta_collection = self.database[KB_META_COLLECTION]
+        self.embedding_dimensions = embedding_dimensions
+        self.vector_index_type = vector_index_type
+        self.write_batch_size = max(1, write_batch_size)
+        self.last_write_errors: List[Dict[str, Any]] = []
+    
+    @classmethod
+    async def create(cls, *args, **kwargs) -> "AsyncCosmosVectorDB":
+        """
+        Create an instance and verify the connection with a ping.
+        
+        Accepts the same arguments as the constructor.
+        """
+        db = cls(*args, **kwargs)
+        try:
+            await db.client.admin.command('ping')
+            print(f"✓ Cosmos DB MongoDB vCore collection '{db.collection.name}' ready (async)")
+        except ConnectionFailure as e:
+            print(f"✗ Failed to connect to Cosmos DB MongoDB vCore: {e}")
+            db.close()
+            raise
+        return db
+    
+    async def insert_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Insert document chunks with embeddings (see CosmosVectorDB.insert_documents).
+        
+        Args:
+            documents: List of document dictionaries with content and embeddings
+            batch_size: Operations per bulk request (default: self.write_batch_size)
+        
+        Returns:
+            Number of documents successfully inserted/updated
+        """
+        batch_size = max(1, batch_size or self.write_batch_size)
+        inserted_count = 0
+        documents, self.last_write_errors = reject_missing_vectors(
+            documents, self.embedding_dimensions
+        )
+        
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start:start + batch_size]
+            operations = build_upsert_operations(batch)
+            
+            try:
+                result = await self.collection.bulk_write(operations, ordered=False)
+                inserted_count += result.upserted_count + result.matched_count
+            except BulkWriteError as e:
+                written, failures = collect_write_errors(batch, e)
+                inserted_count += written
+                self.last_write_errors.extend(failures)
+            except Exception as e:
+                print(f"✗ Error inserting batch of {len(batch)} documents: {e}")
+                self.last_write_errors.extend(
+                    {"_id": doc["_id"], "code": None, "message": str(e)} for doc in batch
+                )
+        
+        if self.last_write_errors:
+            first = self.last_write_errors[0]
+            print(f"✗ {len(self.last_write_errors)} documents failed to insert "
+                  f"(first: {first['_id']}: {first['message']})")
+        
+        print(f"✓ Inserted/Updated {inserted_count} documents")
+        return inserted_count
+    
+    @timed("cosmos.search")
+    async def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        similarity_threshold: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform semantic similarity search (see CosmosVectorDB.search).
+        
+        Args:
+            query_embedding: Question embedding vector (1536 dimensions)
+            top_k: Number of most relevant results to return (default: 5)
+            similarity_threshold: Minimum similarity score 0-1 (0=filter off)
+        
+        Returns:
+            List of documents with content, metadata and similarity
+        """
+        try:
+            pipeline = build_search_pipeline(query_embedding, top_k)
+            results = await self.collection.aggregate(pipeline).to_list(length=None)
+            
+            if similarity_threshold > 0.0:
+                results = [
+                    doc for doc in results
+                    if doc.get("similarity", 0.0) >= similarity_threshold
+                ]
+            
+            return results
+        
+        except Exception as e:
+            print(f"✗ Error during vector search: {e}")
+            print(f"   Make sure vector index '{VECTOR_INDEX_NAME}' exists (python ensure_index.py)")
+            return []
+    
+    async def delete_document(self, doc_id: str) -> bool:
+        """
+        Delete a document by ID.
+        
+        Args:
+            doc_id: Document ID to delete
+        
+        Returns:
+            True if deleted, False otherwise
+        """
+        try:
+            result = await self.collection.delete_one({"_id": doc_id})
+            if result.deleted_count > 0:
+                return True
+            else:
+                print(f"Document {doc_id} not found")
+                return False
+        except Exception as e:
+            print(f"✗ Error deleting document: {e}")
+            return False
+    
+    async def delete_documents(self, doc_ids: List[str]) -> int:
+        """
+        Delete many documents by ID in a single request.
+        
+        Args:
+            doc_ids: Document IDs to delete
+        
+        Returns:
+            Number of documents deleted
+        """
+        if not doc_ids:
+            return 0
+        
+        try:
+            result = await self.collection.delete_many({"_id": {"$in": list(doc_ids)}})
+            return result.deleted_count
+        except Exception as e:
+            print(f"✗ Error deleting documents: {e}")
+            return 0
+    
+    async def count(self) -> int:
+        """
+        Return the number of stored documents.
+        
+        Returns:
+            Document count, or 0 on error
+        """
+        try:
+            return await self.collection.count_documents({})
+        except Exception as e:
+            print(f"✗ Error counting documents: {e}")
+            return 0
+    
+    async def get_generation(self) -> Optional[str]:
+        """
+        Return the knowledge-base generation ID (see CosmosVectorDB.get_generation).
+        
+        Returns:
+            Generation ID ("0" before the first bump), or None on error
+        """
+        try:
+            doc = await self.meta_collection.find_one({"_id": self.collection.name})
+            return str(doc.get("generation", 0)) if doc else "0"
+        except Exception as e:
+            print(f"✗ Error reading knowledge-base generation: {e}")
+            return None
+    
+    async def bump_generation(self) -> Optional[str]:
+        """
+        Advance the knowledge-base generation after the collection changed.
+        
+        Returns:
+            New generation ID, or None on error
+        """
+        try:
+            doc = await self.meta_collection.find_one_and_update(
+                {"_id": self.collection.name},
+                {"$inc": {"generation": 1}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            return str(doc["generation"])
+        except Exception as e:
+            print(f"✗ Error updating knowledge-base generation: {e}")
+            return None
+    
+    def close(self):
+        """Close MongoDB connection."""
+        try:
+            self.client.close()
+        except Exception:
+            pass
@@ -5,10 +5,138 @@ Azure Cosmos DB for MongoDB vCore Vector Database implementation.
 This module provides vector search capabilities using MongoDB vCore API with vector indexes.
 Vector search enables semantic similarity search for RAG (Retrieval-Augmented Generation).
 """
-import hashlib
-from typing import List, Dict, Any
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, OperationFailure
+from typing import List, Dict, Any, Optional, Tuple
+from pymongo import MongoClient, ReplaceOne, ReturnDocument
+from pymongo.errors import BulkWriteError, ConnectionFailure, OperationFailure
+
+from ...monitoring.latency import timed
+from .vector_store import assign_document_id
+
+
+# Name of the cosmosSearch index used by the $search stage
+VECTOR_INDEX_NAME = "vectorSearchIndex"
+
+# Collection holding one knowledge-base generation counter per vector collection
+KB_META_COLLECTION = "kb_meta"
+
+
+def build_upsert_operations(documents: List[Dict[str, Any]]) -> List[ReplaceOne]:
+    """
+    Build upsert operations for a batch of documents.
+    
+    Documents without an `_id` get one derived from a hash of their content
+    (set on the caller's dict, so IDs can be read back after insertion).
+    
+    Args:
+        documents: Document dictionaries with content and embeddings
+        
+    Returns:
+        ReplaceOne operations, one per document
+    """
+    operations = []
+    
+    for doc in documents:
+        # Generate unique ID based on content hash if not present
+        assign_document_id(doc)
+        
+        # Upsert: replace if ID exists, insert if new
+        # This prevents duplicate documents with same content
+        operations.append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True))
+    
+    return operations
+
+
+def reject_missing_vectors(
+    documents: List[Dict[str, Any]],
+    dimensions: int
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Separate documents without a usable embedding from a batch.
+    
+    Cosmos DB accepts a document with an empty or missing `contentVector`,
+    but vector search can never return it, so it is reported as a write
+    failure instead of being stored.
+    
+    Args:
+        documents: Document dictionaries with content and embeddings
+        dimensions: Expected embedding dimensions
+        
+    Returns:
+        (documents to write, list of {"_id", "code", "message"} failures)
+    """
+    valid, failures = [], []
+    for doc in documents:
+        assign_document_id(doc)
+        if len(doc.get("contentVector") or []) == dimensions:
+            valid.append(doc)
+        else:
+            failures.append({
+                "_id": doc["_id"],
+                "code": None,
+                "message": f"contentVector must have {dimensions} dimensions"
+            })
+    return valid, failures
+
+
+def collect_write_errors(
+    documents: List[Dict[str, Any]],
+    error: BulkWriteError
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Extract the success count and per-document failures from a BulkWriteError.
+    
+    Args:
+        documents: The batch that was written
+        error: Error raised by bulk_write
+        
+    Returns:
+        (documents written, list of {"_id", "code", "message"} failures)
+    """
+    details = error.details
+    written = details.get("nUpserted", 0) + details.get("nMatched", 0)
+    # Error indexes are relative to this batch
+    failures = [
+        {
+            "_id": documents[write_error["index"]]["_id"],
+            "code": write_error.get("code"),
+            "message": write_error.get("errmsg")
+        }
+        for write_error in details.get("writeErrors", [])
+    ]
+    return written, failures
+
+
+def build_search_pipeline(query_embedding: List[float], top_k: int) -> List[Dict[str, Any]]:
+    """
+    Build the MongoDB vCore aggregation pipeline for vector search.
+    
+    Args:
+        query_embedding: Question embedding vector (1536 dimensions)
+        top_k: Number of results
+        
+    Returns:
+        Aggregation pipeline returning _id, content, metadata and similarity
+    """
+    return [
+        {
+            "$search": {
+                "cosmosSearch": {
+                    "vector": query_embedding,   # Query vector (1536-dim)
+                    "path": "contentVector",     # Field to search
+                    "k": top_k                   # Number of results
+                },
+                "returnStoredSource": True      # Include document content
+            }
+        },
+        {
+            "$project": {
+                "_id": 1,
+                "content": 1,                    # Text chunk
+                "metadata": 1,                   # Source information
+                "similarity": {"$meta": "searchScore"}  # Relevance score
+            }
+        }
+    ]
 
 
 class CosmosVectorDB:
@@ -29,7 +157,9 @@ class CosmosVectorDB:
         database_name: str,
         collection_name: str,
         embedding_dimensions: int = 1536,
-        vector_index_type: str = "vector-hnsw"
+        vector_index_type: str = "vector-hnsw",
+        write_batch_size: int = 500,
+        read_only: bool = False
     ):
         """
         Initialize Cosmos DB for MongoDB vCore vector database connection.
@@ -43,6 +173,11 @@ class CosmosVectorDB:
                 - 'vector-hnsw': Hierarchical Navigable Small World (recommended)
                 - 'vector-ivf': Inverted File Index (fast but less accurate)
                 - 'vector-diskann': DiskANN (for very large datasets)
+            write_batch_size: Documents per bulk write request in insert_documents
+            read_only: Open for queries only: skip the vector index check
+                (one round trip, and no index/DDL permissions needed) and
+                refuse writes. Ingestion opens the store writable, which
+                ensures the index exists
         """
         try:
             # Connect to MongoDB vCore
@@ -54,11 +189,20 @@ class CosmosVectorDB:
             # Get database and collection
             self.database = self.client[database_name]
             self.collection = self.database[collection_name]
+            self.meta_collection = self.database[KB_META_COLLECTION]
             self.embedding_dimensions = embedding_dimensions
             self.vector_index_type = vector_index_type
+            self.write_batch_size = max(1, write_batch_size)
+            self.last_write_errors: List[Dict[str, Any]] = []
+            self.read_only = read_only
+            
+            if read_only:
+                print(f"✓ Cosmos DB MongoDB vCore collection '{collection_name}' ready (read-only)")
+                return
             
             # Create vector index if it doesn't exist
-            self._create_vector_index()
+            self.ensure_vector_index()
+            self.check_vector_index_dimensions()
             
             print(f"✓ Cosmos DB MongoDB vCore collection '{collection_name}' ready with vector search")
             
@@ -69,25 +213,53 @@ class CosmosVectorDB:
             print(f"✗ Error initializing Cosmos DB: {e}")
             raise
     
-    def _create_vector_index(self):
+    def _require_writable(self):
+        if self.read_only:
+            raise PermissionError("CosmosVectorDB was opened read-only")
+    
+    def has_vector_index(self) -> bool:
+        """Check whether the vector search index exists (no changes made)."""
+        existing_indexes = list(self.collection.list_indexes())
+        return VECTOR_INDEX_NAME in [idx['name'] for idx in existing_indexes]
+    
+    def check_vector_index_dimensions(self):
+        """
+        Raise ValueError if the existing vector index has other dimensions.
+        
+        Vectors of a different size than the index (e.g. after changing
+        EMBEDDING_DIMENSIONS) cannot be searched; the index has to be
+        dropped and the documents re-embedded.
+        """
+        for index in self.collection.list_indexes():
+            if index['name'] != VECTOR_INDEX_NAME:
+                continue
+            dimensions = index.get('cosmosSearchOptions', {}).get('dimensions')
+            if dimensions is not None and dimensions != self.embedding_dimensions:
+                raise ValueError(
+                    f"Vector index '{VECTOR_INDEX_NAME}' has {dimensions} dimensions, "
+                    f"but EMBEDDING_DIMENSIONS is {self.embedding_dimensions}"
+                )
+    
+    def ensure_vector_index(self) -> bool:
         """
         Create vector search index on contentVector field for similarity search.
         
         The vector index enables fast approximate nearest neighbor (ANN) search
         using cosine similarity. This is essential for RAG document retrieval.
+        
+        Returns:
+            True if the index exists or was created, False otherwise
         """
+        self._require_writable()
         try:
             # Check if vector index already exists
-            existing_indexes = list(self.collection.list_indexes())
-            index_names = [idx['name'] for idx in existing_indexes]
-            
-            if 'vectorSearchIndex' in index_names:
+            if self.has_vector_index():
                 print(f"✓ Vector index already exists")
-                return
+                return True
             
             # Create vector index using MongoDB cosmosSearch
             vector_index = {
-                "name": "vectorSearchIndex",
+                "name": VECTOR_INDEX_NAME,
                 "key": {
                     "contentVector": "cosmosSearch"  # Field containing embedding vectors
                 },
@@ -101,7 +273,7 @@ class CosmosVectorDB:
             
             self.collection.create_index(
                 [("contentVector", "cosmosSearch")],
-                name="vectorSearchIndex",
+                name=VECTOR_INDEX_NAME,
                 cosmosSearchOptions={
                     "kind": self.vector_index_type,
                     "numLists": 100,
@@ -111,18 +283,31 @@ class CosmosVectorDB:
             )
             
             print(f"✓ Created vector index: {self.vector_index_type}")
+            return True
             
         except OperationFailure as e:
             # Index might already exist or creation in progress
             print(f"ℹ️  Vector index note: {e}")
+            return False
         except Exception as e:
             print(f"⚠️  Could not create vector index: {e}")
             print(f"   You may need to create it manually in Azure Portal")
+            return False
     
-    def insert_documents(self, documents: List[Dict[str, Any]]) -> int:
+    def insert_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> int:
         """
         Insert document chunks with embeddings into MongoDB collection.
         
+        Documents are upserted with unordered `bulk_write` requests of up to
+        `batch_size` ReplaceOne operations. Per-document failures are collected
+        in `self.last_write_errors` instead of aborting the batch; documents
+        without an `embedding_dimensions` contentVector are reported there
+        and not written.
+        
         Each document should have structure:
         {
             "content": "Text chunk",
@@ -132,37 +317,45 @@ class CosmosVectorDB:
         
         Args:
             documents: List of document dictionaries with content and embeddings
+            batch_size: Operations per bulk request (default: self.write_batch_size)
             
         Returns:
             Number of documents successfully inserted/updated
         """
+        self._require_writable()
+        batch_size = max(1, batch_size or self.write_batch_size)
         inserted_count = 0
+        documents, self.last_write_errors = reject_missing_vectors(
+            documents, self.embedding_dimensions
+        )
         
-        for doc in documents:
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start:start + batch_size]
+            operations = build_upsert_operations(batch)
+            
             try:
-                # Generate unique ID based on content hash if not present
-                if "_id" not in doc:
-                    content_hash = hashlib.md5(
-                        doc.get("content", "").encode()
-                    ).hexdigest()
-                    doc["_id"] = f"doc_{content_hash}"
-                
-                # Upsert: replace if ID exists, insert if new
-                # This prevents duplicate documents with same content
-                self.collection.replace_one(
-                    {"_id": doc["_id"]},
-                    doc,
-                    upsert=True
-                )
-                inserted_count += 1
-                
+                # Unordered: one failed document does not stop the rest of the batch
+                result = self.collection.bulk_write(operations, ordered=False)
+                inserted_count += result.upserted_count + result.matched_count
+            except BulkWriteError as e:
+                written, failures = collect_write_errors(batch, e)
+                inserted_count += written
+                self.last_write_errors.extend(failures)
             except Exception as e:
-                print(f"✗ Error inserting document: {e}")
-                continue
+                print(f"✗ Error inserting batch of {len(batch)} documents: {e}")
+                self.last_write_errors.extend(
+                    {"_id": doc["_id"], "code": None, "message": str(e)} for doc in batch
+                )
+        
+        if self.last_write_errors:
+            first = self.last_write_errors[0]
+            print(f"✗ {len(self.last_write_errors)} documents failed to insert "
+                  f"(first: {first['_id']}: {first['message']})")
         
         print(f"✓ Inserted/Updated {inserted_count} documents")
         return inserted_count
     
+    @timed("cosmos.search")
     def search(
         self, 
         query_embedding: List[float], 
@@ -190,26 +383,7 @@ class CosmosVectorDB:
         """
         try:
             # MongoDB aggregation pipeline for vector search
-            pipeline = [
-                {
-                    "$search": {
-                        "cosmosSearch": {
-                            "vector": query_embedding,  # Query vector (1536-dim)
-                            "path": "contentVector",     # Field to search
-                            "k": top_k                   # Number of results
-                        },
-                        "returnStoredSource": True      # Include document content
-                    }
-                },
-                {
-                    "$project": {
-                        "_id": 1,
-                        "content": 1,                    # Text chunk
-                        "metadata": 1,                   # Source information
-                        "similarity": {"$meta": "searchScore"}  # Relevance score
-                    }
-                }
-            ]
+            pipeline = build_search_pipeline(query_embedding, top_k)
             
             # Execute vector search
             results = list(self.collection.aggregate(pipeline))
@@ -225,7 +399,7 @@ class CosmosVectorDB:
             
         except Exception as e:
             print(f"✗ Error during vector search: {e}")
-            print(f"   Make sure vector index 'vectorSearchIndex' exists in Azure Portal")
+            print(f"   Make sure vector index '{VECTOR_INDEX_NAME}' exists (python ensure_index.py)")
             return []
     
     def delete_document(self, doc_id: str) -> bool:
@@ -238,6 +412,7 @@ class CosmosVectorDB:
         Returns:
             True if deleted, False otherwise
         """
+        self._require_writable()
         try:
             result = self.collection.delete_one({"_id": doc_id})
             if result.deleted_count > 0:
@@ -249,6 +424,77 @@ class CosmosVectorDB:
             print(f"✗ Error deleting document: {e}")
             return False
     
+    def delete_documents(self, doc_ids: List[str]) -> int:
+        """
+        Delete many documents by ID in a single request.
+        
+        Args:
+            doc_ids: Document IDs to delete
+            
+        Returns:
+            Number of documents deleted
+        """
+        self._require_writable()
+        if not doc_ids:
+            return 0
+        
+        try:
+            result = self.collection.delete_many({"_id": {"$in": list(doc_ids)}})
+            return result.deleted_count
+        except Exception as e:
+            print(f"✗ Error deleting documents: {e}")
+            return 0
+    
+    def count(self) -> int:
+        """
+        Return the number of stored documents.
+        
+        Returns:
+            Document count, or 0 on error
+        """
+        try:
+            return self.collection.count_documents({})
+        except Exception as e:
+            print(f"✗ Error counting documents: {e}")
+            return 0
+    
+    def get_generation(self) -> Optional[str]:
+        """
+        Return the knowledge-base generation ID of this collection.
+        
+        The generation changes whenever ingestion modifies the collection,
+        so caches keyed by it are invalidated by new or removed documents.
+        
+        Returns:
+            Generation ID ("0" before the first bump), or None on error
+        """
+        try:
+            doc = self.meta_collection.find_one({"_id": self.collection.name})
+            return str(doc.get("generation", 0)) if doc else "0"
+        except Exception as e:
+            print(f"✗ Error reading knowledge-base generation: {e}")
+            return None
+    
+    def bump_generation(self) -> Optional[str]:
+        """
+        Advance the knowledge-base generation after the collection changed.
+        
+        Returns:
+            New generation ID, or None on error
+        """
+        self._require_writable()
+        try:
+            doc = self.meta_collection.find_one_and_update(
+                {"_id": self.collection.name},
+                {"$inc": {"generation": 1}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            return str(doc["generation"])
+        except Exception as e:
+            print(f"✗ Error updating knowledge-base generation: {e}")
+            return None
+    
     def close(self):
         """Close MongoDB connection."""
         try:
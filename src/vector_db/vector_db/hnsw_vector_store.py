@@ -0,0 +1,504 @@
+"""
+Local approximate nearest-neighbour vector store (HNSW).
+
+Implements the Hierarchical Navigable Small World graph of Malkov & Yashunin
+on top of NumPy. Nodes are linked to at most `m` neighbours per layer
+(`2 * m` on the bottom layer), and a query descends greedily from the sparse
+top layer before a best-first search of `ef_search` candidates on the
+bottom layer. Each search step scores all unvisited neighbours of a node
+with one matrix-vector product, so a query touches a few hundred vectors
+instead of the whole corpus.
+
+Deleting a document only marks its node; deleted nodes keep routing
+searches but are never returned. Once more than half the nodes are
+deleted, the graph is rebuilt from the live ones.
+"""
+import os
+import json
+import math
+import heapq
+import random
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ...monitoring.latency import timed
+from .vector_store import assign_document_id
+
+
+FILE_FORMAT_VERSION = 1
+
+
+class HNSWVectorStore:
+    """
+    VectorStore backend searching an in-memory HNSW graph.
+    
+    Similarity is cosine similarity (1 = same direction), like Cosmos DB's
+    COS index. Also provides the knowledge-base generation used by the
+    answer caches.
+    """
+    
+    def __init__(
+        self,
+        embedding_dimensions: int = 1536,
+        path: Optional[str] = None,
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+        seed: Optional[int] = None
+    ):
+        """
+        Create the store, loading `path` if it exists.
+        
+        Args:
+            embedding_dimensions: Vector dimensions (1536 for text-embedding-ada-002)
+            path: Optional index file the store is loaded from and saved to
+                on `save()` / `close()`
+            m: Links per node and layer (bottom layer: 2 * m). Higher values
+                improve recall at the cost of memory and insert time
+            ef_construction: Candidates considered when linking a new node
+            ef_search: Candidates considered per query (at least top_k);
+                the main recall/latency trade-off, can be changed at any time
+            seed: Seed for the random layer assignment
+        
+        `m` and `ef_construction` shape the graph, so an existing index
+        file keeps the values it was built with.
+        """
+        self.embedding_dimensions = embedding_dimensions
+        self.path = Path(path) if path else None
+        self.m = max(2, m)
+        self.ef_construction = max(self.m, ef_construction)
+        self.ef_search = max(1, ef_search)
+        self.last_write_errors: List[Dict[str, Any]] = []
+        self.generation = 0
+        self._random = random.Random(seed)
+        self._reset()
+        self._dirty = False
+        self._lock = threading.Lock()
+        
+        if self.path and self.path.exists():
+            self._load()
+        print(f"✓ HNSW vector store ready ({len(self._rows)} documents, "
+              f"M={self.m}, efConstruction={self.ef_construction}, efSearch={self.ef_search})")
+    
+    def _reset(self):
+        """Drop all nodes."""
+        # Node i: vector _vectors[i], _links[i][layer] neighbour lists for
+        # layers 0.._levels[i], document _ids[i] / _documents[i]
+        self._vectors = np.zeros((0, self.embedding_dimensions), dtype=np.float32)
+        self._levels: List[int] = []
+        self._links: List[List[List[int]]] = []
+        self._ids: List[Optional[str]] = []
+        self._documents: List[Optional[Dict[str, Any]]] = []
+        self._rows: Dict[str, int] = {}
+        self._deleted: set = set()
+        self._entry_point = -1
+        self._max_level = -1
+    
+    def _normalize(self, vector: List[float]) -> Optional[np.ndarray]:
+        array = np.asarray(vector, dtype=np.float32)
+        if array.shape != (self.embedding_dimensions,):
+            return None
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else None
+    
+    def _max_links(self, layer: int) -> int:
+        return 2 * self.m if layer == 0 else self.m
+    
+    def _random_level(self) -> int:
+        # P(level >= l) = m ** -l
+        return int(-math.log(1.0 - self._random.random()) / math.log(self.m))
+    
+    def _search_layer(
+        self,
+        query: np.ndarray,
+        entry_points: List[Tuple[float, int]],
+        ef: int,
+        layer: int,
+        skip_deleted: bool = False
+    ) -> List[Tuple[float, int]]:
+        """
+        Best-first search of one layer.
+        
+        Args:
+            query: Normalized query vector
+            entry_points: (distance, node) pairs to start from
+            ef: Number of nearest nodes to keep
+            layer: Graph layer to search
+            skip_deleted: Route through deleted nodes but leave them out of
+                the result
+        
+        Returns:
+            Up to `ef` (distance, node) pairs, nearest first; distance is
+            1 - cosine similarity
+        """
+        visited = {node for _, node in entry_points}
+        candidates = list(entry_points)
+        heapq.heapify(candidates)
+        # Max-heap of the best nodes found so far, as (-distance, node)
+        found = [
+            (-distance, node) for distance, node in entry_points
+            if not (skip_deleted and node in self._deleted)
+        ]
+        heapq.heapify(found)
+        
+        while candidates:
+            distance, node = heapq.heappop(candidates)
+            if len(found) >= ef and distance > -found[0][0]:
+                break
+            
+            neighbours = [n for n in self._links[node][layer] if n not in visited]
+            if not neighbours:
+                continue
+            visited.update(neighbours)
+            distances = 1.0 - self._vectors[neighbours] @ query
+            
+            for neighbour, neighbour_distance in zip(neighbours, distances.tolist()):
+                if len(found) < ef or neighbour_distance < -found[0][0]:
+                    heapq.heappush(candidates, (neighbour_distance, neighbour))
+                    if skip_deleted and neighbour in self._deleted:
+                        continue
+                    heapq.heappush(found, (-neighbour_distance, neighbour))
+                    if len(found) > ef:
+                        heapq.heappop(found)
+        
+        return sorted((-distance, node) for distance, node in found)
+    
+    def _select_neighbours(self, candidates: List[Tuple[float, int]], count: int) -> List[int]:
+        """
+        Pick up to `count` neighbours with the HNSW diversity heuristic.
+        
+        A candidate is kept only if it is closer to the new node than to
+        every neighbour already kept, so links spread out in different
+        directions instead of clustering.
+        """
+        selected: List[int] = []
+        for distance, node in candidates:
+            if len(selected) >= count:
+                break
+            if selected:
+                distances_to_selected = 1.0 - self._vectors[selected] @ self._vectors[node]
+                if distances_to_selected.min() < distance:
+                    continue
+            selected.append(node)
+        return selected
+    
+    def _greedy_descent(self, query: np.ndarray, target_layer: int) -> List[Tuple[float, int]]:
+        """Walk from the entry point down to `target_layer`, one nearest node per layer."""
+        entry = self._entry_point
+        nearest = [(float(1.0 - self._vectors[entry] @ query), entry)]
+        for layer in range(self._max_level, target_layer, -1):
+            nearest = self._search_layer(query, nearest, 1, layer)
+        return nearest
+    
+    def _add_node(self, vector: np.ndarray, doc_id: str, document: Dict[str, Any]) -> int:
+        """Append a node and link it into the graph."""
+        node = len(self._ids)
+        if node == len(self._vectors):
+            grown = np.zeros((max(64, 2 * node), self.embedding_dimensions), dtype=np.float32)
+            grown[:node] = self._vectors[:node]
+            self._vectors = grown
+        
+        level = self._random_level()
+        self._vectors[node] = vector
+        self._levels.append(level)
+        self._links.append([[] for _ in range(level + 1)])
+        self._ids.append(doc_id)
+        self._documents.append(document)
+        
+        if self._entry_point < 0:
+            self._entry_point, self._max_level = node, level
+            return node
+        
+        nearest = self._greedy_descent(vector, level)
+        for layer in range(min(level, self._max_level), -1, -1):
+            nearest = self._search_layer(vector, nearest, self.ef_construction, layer)
+            neighbours = self._select_neighbours(nearest, self.m)
+            self._links[node][layer] = neighbours
+            
+            for neighbour in neighbours:
+                links = self._links[neighbour][layer]
+                links.append(node)
+                if len(links) > self._max_links(layer):
+                    # Re-select the over-full neighbour's links among its
+                    # current ones plus the new node
+                    distances = 1.0 - self._vectors[links] @ self._vectors[neighbour]
+                    ranked = sorted(zip(distances.tolist(), links))
+                    self._links[neighbour][layer] = self._select_neighbours(
+                        ranked, self._max_links(layer)
+                    )
+        
+        if level > self._max_level:
+            self._entry_point, self._max_level = node, level
+        return node
+    
+    def insert_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Insert or replace documents (keyed by `_id`, see CosmosVectorDB).
+        
+        Documents whose embedding is missing or has the wrong dimensions are
+        reported in `self.last_write_errors` and skipped.
+        
+        Args:
+            documents: List of document dictionaries with content and embeddings
+            batch_size: Ignored, accepted for VectorStore compatibility
+        
+        Returns:
+            Number of documents inserted/updated
+        """
+        self.last_write_errors = []
+        written = 0
+        
+        with self._lock:
+            for doc in documents:
+                doc_id = assign_document_id(doc)
+                vector = self._normalize(doc.get("contentVector", []))
+                if vector is None:
+                    self.last_write_errors.append({
+                        "_id": doc_id,
+                        "code": None,
+                        "message": f"contentVector must have {self.embedding_dimensions} non-zero dimensions"
+                    })
+                    continue
+                
+                document = {
+                    "content": doc.get("content", ""),
+                    "metadata": doc.get("metadata", {}),
+                }
+                node = self._rows.get(doc_id)
+                if node is not None and np.array_equal(self._vectors[node], vector):
+                    # Re-ingested unchanged chunk: no need to touch the graph
+                    self._documents[node] = document
+                else:
+                    if node is not None:
+                        self._delete_node(node)
+                    self._rows[doc_id] = self._add_node(vector, doc_id, document)
+                written += 1
+            
+            self._dirty = self._dirty or written > 0
+        
+        if self.last_write_errors:
+            first = self.last_write_errors[0]
+            print(f"✗ {len(self.last_write_errors)} documents failed to insert "
+                  f"(first: {first['_id']}: {first['message']})")
+        
+        print(f"✓ Inserted/Updated {written} documents")
+        return written
+    
+    @timed("hnsw.search")
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        similarity_threshold: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Approximate cosine-similarity search.
+        
+        Args:
+            query_embedding: Question embedding vector
+            top_k: Number of most relevant results to return (default: 5)
+            similarity_threshold: Minimum similarity score 0-1 (0=filter off)
+        
+        Returns:
+            List of documents with _id, content, metadata and similarity,
+            most similar first
+        """
+        query = self._normalize(query_embedding)
+        if query is None:
+            return []
+        
+        with self._lock:
+            if not self._rows or top_k <= 0:
+                return []
+            nearest = self._greedy_descent(query, 0)
+            nearest = self._search_layer(
+                query, nearest, max(self.ef_search, top_k), 0, skip_deleted=True
+            )
+            
+            results = [
+                {
+                    "_id": self._ids[node],
+                    "content": self._documents[node]["content"],
+                    "metadata": self._documents[node]["metadata"],
+                    "similarity": 1.0 - distance,
+                }
+                for distance, node in nearest[:top_k]
+            ]
+        
+        if similarity_threshold > 0.0:
+            results = [doc for doc in results if doc["similarity"] >= similarity_threshold]
+        return results
+    
+    def _delete_node(self, node: int):
+        """Mark a node deleted; it keeps routing searches until the next rebuild."""
+        del self._rows[self._ids[node]]
+        self._deleted.add(node)
+        self._documents[node] = None
+    
+    def delete_document(self, doc_id: str) -> bool:
+        """
+        Delete a document by ID.
+        
+        Args:
+            doc_id: Document ID to delete
+        
+        Returns:
+            True if deleted, False otherwise
+        """
+        return self.delete_documents([doc_id]) == 1
+    
+    def delete_documents(self, doc_ids: List[str]) -> int:
+        """
+        Delete many documents by ID.
+        
+        Args:
+            doc_ids: Document IDs to delete
+        
+        Returns:
+            Number of documents deleted
+        """
+        deleted = 0
+        with self._lock:
+            for doc_id in doc_ids:
+                node = self._rows.get(doc_id)
+                if node is None:
+                    continue
+                self._delete_node(node)
+                deleted += 1
+            
+            if len(self._deleted) > len(self._rows):
+                self._rebuild()
+            self._dirty = self._dirty or deleted > 0
+        return deleted
+    
+    def _rebuild(self):
+        """Rebuild the graph from the live nodes, dropping deleted ones."""
+        live = sorted(self._rows.values())
+        vectors = self._vectors[live].copy()
+        ids = [self._ids[node] for node in live]
+        documents = [self._documents[node] for node in live]
+        
+        self._reset()
+        for vector, doc_id, document in zip(vectors, ids, documents):
+            self._rows[doc_id] = self._add_node(vector, doc_id, document)
+    
+    def rebuild(self):
+        """Rebuild the graph now, reclaiming the space of deleted documents."""
+        with self._lock:
+            self._rebuild()
+            self._dirty = True
+    
+    def count(self) -> int:
+        """Return the number of stored documents."""
+        return len(self._rows)
+    
+    def get_generation(self) -> Optional[str]:
+        """Return the knowledge-base generation ID (see CosmosVectorDB.get_generation)."""
+        return str(self.generation)
+    
+    def bump_generation(self) -> Optional[str]:
+        """Advance the knowledge-base generation after the documents changed."""
+        with self._lock:
+            self.generation += 1
+            self._dirty = True
+        return str(self.generation)
+    
+    def _load(self):
+        """Load an index written by `save()`."""
+        with np.load(self.path, allow_pickle=False) as data:
+            vectors = data["vectors"]
+            levels = data["levels"].tolist()
+            link_counts = data["link_counts"].tolist()
+            links = data["links"].tolist()
+            deleted = data["deleted"].nonzero()[0].tolist()
+            state = json.loads(data["state"].tobytes().decode("utf-8"))
+        
+        if state.get("version") != FILE_FORMAT_VERSION:
+            raise ValueError(f"{self.path} has unsupported format version {state.get('version')}")
+        if vectors.shape[1:] != (self.embedding_dimensions,):
+            raise ValueError(
+                f"{self.path} holds {vectors.shape[1]}-dimensional vectors, "
+                f"expected {self.embedding_dimensions}"
+            )
+        
+        # One neighbour list per node and layer, node-major, bottom layer first
+        node_links: List[List[List[int]]] = []
+        lists = iter(link_counts)
+        offset = 0
+        for level in levels:
+            layers = []
+            for _ in range(level + 1):
+                count = next(lists)
+                layers.append(links[offset:offset + count])
+                offset += count
+            node_links.append(layers)
+        
+        self.m = state["m"]
+        self.ef_construction = state["ef_construction"]
+        self.generation = state.get("generation", 0)
+        self._vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self._levels = levels
+        self._links = node_links
+        self._ids = state["ids"]
+        self._documents = state["documents"]
+        self._deleted = set(deleted)
+        self._rows = {
+            doc_id: node for node, doc_id in enumerate(self._ids)
+            if node not in self._deleted
+        }
+        self._entry_point = state["entry_point"]
+        self._max_level = state["max_level"]
+    
+    def save(self):
+        """
+        Write the index to `path` atomically (no-op without a path).
+        
+        The file holds the float32 vectors, the graph as flat int32 link
+        arrays, and the documents as JSON.
+        """
+        if not self.path:
+            return
+        
+        with self._lock:
+            size = len(self._ids)
+            link_counts = [len(layer) for layers in self._links for layer in layers]
+            links = [neighbour for layers in self._links for layer in layers for neighbour in layer]
+            deleted = np.zeros(size, dtype=bool)
+            deleted[list(self._deleted)] = True
+            state = json.dumps({
+                "version": FILE_FORMAT_VERSION,
+                "m": self.m,
+                "ef_construction": self.ef_construction,
+                "entry_point": self._entry_point,
+                "max_level": self._max_level,
+                "generation": self.generation,
+                "ids": self._ids,
+                "documents": self._documents,
+            }).encode("utf-8")
+            
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "wb") as file:
+                np.savez(
+                    file,
+                    vectors=self._vectors[:size],
+                    levels=np.asarray(self._levels, dtype=np.int8),
+                    link_counts=np.asarray(link_counts, dtype=np.int32),
+                    links=np.asarray(links, dtype=np.int32),
+                    deleted=deleted,
+                    state=np.frombuffer(state, dtype=np.uint8)
+                )
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+    
+    def close(self):
+        """Persist unsaved changes."""
+        if self._dirty:
+            self.save()
@@ -0,0 +1,284 @@
+"""
+Local in-memory vector store with exact search.
+
+An HR corpus of a few thousand chunks fits comfortably in RAM, and exact
+search over it is faster than a network round trip to Cosmos DB. All
+embeddings live in one contiguous float32 matrix, L2-normalized at insert,
+so a query is a single matrix-vector product followed by an `argpartition`
+top-k. The store can be persisted to a `.npz` file, which lets ingestion and
+question answering run fully offline.
+"""
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ...monitoring.latency import timed
+from .vector_store import assign_document_id
+
+
+class InMemoryVectorStore:
+    """
+    VectorStore backend keeping documents and embeddings in process memory.
+    
+    Similarity is cosine similarity (1 = same direction), like Cosmos DB's
+    COS index. Also provides the knowledge-base generation used by the
+    answer caches.
+    """
+    
+    def __init__(self, embedding_dimensions: int = 1536, path: Optional[str] = None):
+        """
+        Create the store, loading `path` if it exists.
+        
+        Args:
+            embedding_dimensions: Vector dimensions (1536 for text-embedding-ada-002)
+            path: Optional `.npz` file the store is loaded from and saved to
+                on `save()` / `close()`
+        """
+        self.embedding_dimensions = embedding_dimensions
+        self.path = Path(path) if path else None
+        self.last_write_errors: List[Dict[str, Any]] = []
+        self.generation = 0
+        
+        # Rows [0, _size) are in use; row i belongs to _ids[i] / _documents[i]
+        self._vectors = np.zeros((0, embedding_dimensions), dtype=np.float32)
+        self._ids: List[str] = []
+        self._documents: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._size = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        
+        if self.path and self.path.exists():
+            self._load()
+        print(f"✓ Local vector store ready ({self._size} documents)")
+    
+    def _normalize(self, vector: List[float]) -> Optional[np.ndarray]:
+        array = np.asarray(vector, dtype=np.float32)
+        if array.shape != (self.embedding_dimensions,):
+            return None
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else None
+    
+    def _reserve(self, rows: int):
+        """Grow the matrix (geometrically) to hold at least `rows` rows."""
+        if rows <= len(self._vectors):
+            return
+        capacity = max(rows, 2 * len(self._vectors), 64)
+        grown = np.zeros((capacity, self.embedding_dimensions), dtype=np.float32)
+        grown[:self._size] = self._vectors[:self._size]
+        self._vectors = grown
+    
+    def insert_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Insert or replace documents (keyed by `_id`, see CosmosVectorDB).
+        
+        Documents whose embedding is missing or has the wrong dimensions are
+        reported in `self.last_write_errors` and skipped.
+        
+        Args:
+            documents: List of document dictionaries with content and embeddings
+            batch_size: Ignored, accepted for VectorStore compatibility
+        
+        Returns:
+            Number of documents inserted/updated
+        """
+        self.last_write_errors = []
+        written = 0
+        
+        with self._lock:
+            self._reserve(self._size + len(documents))
+            for doc in documents:
+                doc_id = assign_document_id(doc)
+                vector = self._normalize(doc.get("contentVector", []))
+                if vector is None:
+                    self.last_write_errors.append({
+                        "_id": doc_id,
+                        "code": None,
+                        "message": f"contentVector must have {self.embedding_dimensions} non-zero dimensions"
+                    })
+                    continue
+                
+                row = self._rows.get(doc_id)
+                if row is None:
+                    row = self._size
+                    self._rows[doc_id] = row
+                    self._ids.append(doc_id)
+                    self._documents.append({})
+                    self._size += 1
+                
+                self._vectors[row] = vector
+                self._documents[row] = {
+                    "content": doc.get("content", ""),
+                    "metadata": doc.get("metadata", {}),
+                }
+                written += 1
+            
+            self._dirty = self._dirty or written > 0
+        
+        if self.last_write_errors:
+            first = self.last_write_errors[0]
+            print(f"✗ {len(self.last_write_errors)} documents failed to insert "
+                  f"(first: {first['_id']}: {first['message']})")
+        
+        print(f"✓ Inserted/Updated {written} documents")
+        return written
+    
+    @timed("local.search")
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        similarity_threshold: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Exact cosine-similarity search.
+        
+        Args:
+            query_embedding: Question embedding vector
+            top_k: Number of most relevant results to return (default: 5)
+            similarity_threshold: Minimum similarity score 0-1 (0=filter off)
+        
+        Returns:
+            List of documents with _id, content, metadata and similarity,
+            most similar first
+        """
+        query = self._normalize(query_embedding)
+        if query is None:
+            return []
+        
+        with self._lock:
+            if self._size == 0 or top_k <= 0:
+                return []
+            scores = self._vectors[:self._size] @ query
+            
+            k = min(top_k, self._size)
+            top = np.argpartition(-scores, k - 1)[:k] if k < self._size else np.arange(self._size)
+            top = top[np.argsort(-scores[top])]
+            
+            results = [
+                {
+                    "_id": self._ids[row],
+                    "content": self._documents[row]["content"],
+                    "metadata": self._documents[row]["metadata"],
+                    "similarity": float(scores[row]),
+                }
+                for row in top
+            ]
+        
+        if similarity_threshold > 0.0:
+            results = [doc for doc in results if doc["similarity"] >= similarity_threshold]
+        return results
+    
+    def delete_document(self, doc_id: str) -> bool:
+        """
+        Delete a document by ID.
+        
+        Args:
+            doc_id: Document ID to delete
+        
+        Returns:
+            True if deleted, False otherwise
+        """
+        return self.delete_documents([doc_id]) == 1
+    
+    def delete_documents(self, doc_ids: List[str]) -> int:
+        """
+        Delete many documents by ID.
+        
+        The last row is moved into each freed row, keeping the matrix
+        contiguous.
+        
+        Args:
+            doc_ids: Document IDs to delete
+        
+        Returns:
+            Number of documents deleted
+        """
+        deleted = 0
+        with self._lock:
+            for doc_id in doc_ids:
+                row = self._rows.pop(doc_id, None)
+                if row is None:
+                    continue
+                
+                last = self._size - 1
+                if row != last:
+                    self._vectors[row] = self._vectors[last]
+                    self._ids[row] = self._ids[last]
+                    self._documents[row] = self._documents[last]
+                    self._rows[self._ids[row]] = row
+                self._ids.pop()
+                self._documents.pop()
+                self._size -= 1
+                deleted += 1
+            
+            self._dirty = self._dirty or deleted > 0
+        return deleted
+    
+    def count(self) -> int:
+        """Return the number of stored documents."""
+        return self._size
+    
+    def get_generation(self) -> Optional[str]:
+        """Return the knowledge-base generation ID (see CosmosVectorDB.get_generation)."""
+        return str(self.generation)
+    
+    def bump_generation(self) -> Optional[str]:
+        """Advance the knowledge-base generation after the documents changed."""
+        with self._lock:
+            self.generation += 1
+            self._dirty = True
+        return str(self.generation)
+    
+    def _load(self):
+        """Load vectors and documents saved by `save()`."""
+        with np.load(self.path, allow_pickle=False) as data:
+            vectors = data["vectors"]
+            state = json.loads(data["state"].tobytes().decode("utf-8"))
+        
+        if vectors.shape[1:] != (self.embedding_dimensions,):
+            raise ValueError(
+                f"{self.path} holds {vectors.shape[1]}-dimensional vectors, "
+                f"expected {self.embedding_dimensions}"
+            )
+        
+        self._vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self._ids = state["ids"]
+        self._documents = state["documents"]
+        self._rows = {doc_id: row for row, doc_id in enumerate(self._ids)}
+        self._size = len(self._ids)
+        self.generation = state.get("generation", 0)
+    
+    def save(self):
+        """Write the store to `path` atomically (no-op without a path)."""
+        if not self.path:
+            return
+        
+        with self._lock:
+            state = json.dumps({
+                "version": 1,
+                "generation": self.generation,
+                "ids": self._ids,
+                "documents": self._documents,
+            }).encode("utf-8")
+            vectors = self._vectors[:self._size]
+            
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "wb") as file:
+                np.savez(file, vectors=vectors, state=np.frombuffer(state, dtype=np.uint8))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+    
+    def close(self):
+        """Persist unsaved changes."""
+        if self._dirty:
+            self.save()
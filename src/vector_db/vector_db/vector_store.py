@@ -0,0 +1,114 @@
+"""
+Vector store interface shared by the storage backends.
+
+HRAssistantTeam and the ingestion pipeline only rely on the methods of
+`VectorStore`, so any backend providing them can be plugged in:
+CosmosVectorDB (Azure Cosmos DB for MongoDB vCore), its Motor-based async
+twin, or the local InMemoryVectorStore and HNSWVectorStore.
+"""
+import hashlib
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+
+
+# VECTOR_STORE_BACKEND values served from this process instead of Cosmos DB
+LOCAL_BACKENDS = ("memory", "hnsw")
+
+
+def assign_document_id(doc: Dict[str, Any]) -> str:
+    """
+    Return a document's `_id`, deriving it from a content hash if missing.
+    
+    The ID is set on the caller's dict so it can be read back after
+    insertion; identical chunks map to the same ID in every backend.
+    """
+    if "_id" not in doc:
+        content_hash = hashlib.md5(doc.get("content", "").encode()).hexdigest()
+        doc["_id"] = f"doc_{content_hash}"
+    return doc["_id"]
+
+
+@runtime_checkable
+class VectorStore(Protocol):
+    """
+    Storage and similarity search of embedded document chunks.
+    
+    Documents are dicts with `content`, `contentVector` and `metadata`
+    (and optionally `_id`). Search results carry `_id`, `content`,
+    `metadata` and `similarity`. Async backends provide the same methods
+    as coroutines.
+    """
+    
+    def insert_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> int:
+        """Insert or replace documents; return how many were written."""
+        ...
+    
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        similarity_threshold: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """Return the `top_k` documents most similar to the query, best first."""
+        ...
+    
+    def delete_documents(self, doc_ids: List[str]) -> int:
+        """Delete documents by ID; return how many were deleted."""
+        ...
+    
+    def count(self) -> int:
+        """Return the number of stored documents."""
+        ...
+    
+    def close(self) -> None:
+        """Release connections or persist state."""
+        ...
+
+
+def open_local_store(settings: ModuleType) -> VectorStore:
+    """
+    Open the local backend selected by `settings.VECTOR_STORE_BACKEND`.
+    
+    Args:
+        settings: The `config.settings` module
+    
+    Returns:
+        InMemoryVectorStore or HNSWVectorStore, loaded from its file if present
+    """
+    # Imported on use, so NumPy only loads for local backends
+    if settings.VECTOR_STORE_BACKEND == "hnsw":
+        from .hnsw_vector_store import HNSWVectorStore
+        return HNSWVectorStore(
+            embedding_dimensions=settings.EMBEDDING_DIMENSIONS,
+            path=settings.HNSW_INDEX_PATH,
+            m=settings.HNSW_M,
+            ef_construction=settings.HNSW_EF_CONSTRUCTION,
+            ef_search=settings.HNSW_EF_SEARCH
+        )
+    
+    from .memory_vector_store import InMemoryVectorStore
+    return InMemoryVectorStore(
+        embedding_dimensions=settings.EMBEDDING_DIMENSIONS,
+        path=settings.LOCAL_VECTOR_STORE_PATH
+    )
+
+
+def vector_store_target(settings: ModuleType) -> str:
+    """
+    Identify the store selected by `settings.VECTOR_STORE_BACKEND`.
+    
+    Args:
+        settings: The `config.settings` module
+    
+    Returns:
+        Backend plus store path (local) or database/collection (Cosmos DB)
+    """
+    if settings.VECTOR_STORE_BACKEND == "hnsw":
+        return f"hnsw:{settings.HNSW_INDEX_PATH.resolve()}"
+    if settings.VECTOR_STORE_BACKEND in LOCAL_BACKENDS:
+        return f"memory:{settings.LOCAL_VECTOR_STORE_PATH.resolve()}"
+    return f"cosmos:{settings.COSMOS_DATABASE_NAME}/{settings.COSMOS_COLLECTION_NAME}"
@@ -0,0 +1,61 @@
+"""
+Shared fixtures for the offline test suite.
+
+Nothing here talks to Azure: embeddings come from `FakeEmbedder` and
+documents live in the local vector stores.
+"""
+import sys
+import hashlib
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pytest
+
+# Add the project root to the path, like the entry-point scripts do
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.monitoring.usage import TokenUsage, UsageTracker
+
+
+DIMENSIONS = 16
+
+
+def fake_embedding(text: str, dimensions: int = DIMENSIONS) -> List[float]:
+    """Deterministic pseudo-random unit vector for a text."""
+    seed = int.from_bytes(hashlib.md5(text.encode()).digest()[:4], "little")
+    vector = np.random.default_rng(seed).normal(size=dimensions)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class FakeEmbedder:
+    """Stands in for PDFProcessor wherever only question embeddings are needed."""
+    
+    def __init__(self, dimensions: int = DIMENSIONS):
+        self.dimensions = dimensions
+        self.usage = UsageTracker(0.0, 0.0, 0.0)
+        self.calls = 0
+    
+    async def generate_embedding_async(self, text: str, usage: Optional[TokenUsage] = None) -> List[float]:
+        self.calls += 1
+        return fake_embedding(text, self.dimensions)
+    
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def embedder() -> FakeEmbedder:
+    return FakeEmbedder()
+
+
+@pytest.fixture
+def processor():
+    """PDFProcessor for chunking tests; its Azure clients are never called."""
+    from src.processors.pdf_processor import PDFProcessor
+    return PDFProcessor(
+        azure_endpoint="https://example.invalid",
+        azure_api_key="test",
+        api_version="2024-02-01",
+        embedding_model="test-embedding"
+    )
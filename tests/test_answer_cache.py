@@ -0,0 +1,78 @@
+"""
+Exact-match answer cache: normalization, LRU eviction, TTL and persistence.
+"""
+from src.agents import answer_cache
+from src.agents.answer_cache import AnswerCache, normalize_question
+
+
+def test_normalize_question_ignores_case_spacing_and_punctuation():
+    assert normalize_question("  How many  vacation days do I get?! ") == "how many vacation days do i get"
+
+
+def test_hit_requires_same_top_k_and_generation():
+    cache = AnswerCache()
+    cache.put("How many vacation days?", 5, "1", "25")
+    
+    assert cache.get("how many vacation days", 5, "1") == "25"
+    assert cache.get("How many vacation days?", 3, "1") is None
+    assert cache.get("How many vacation days?", 5, "2") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = AnswerCache(max_entries=2)
+    cache.put("a", 5, "0", "A")
+    cache.put("b", 5, "0", "B")
+    cache.get("a", 5, "0")
+    cache.put("c", 5, "0", "C")
+    
+    assert len(cache) == 2
+    assert cache.get("b", 5, "0") is None
+    assert cache.get("a", 5, "0") == "A"
+    assert cache.get("c", 5, "0") == "C"
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(answer_cache.time, "time", lambda: now[0])
+    cache = AnswerCache(ttl_seconds=60)
+    cache.put("q", 5, "0", "answer")
+    
+    now[0] += 59
+    assert cache.get("q", 5, "0") == "answer"
+    now[0] += 2
+    assert cache.get("q", 5, "0") is None
+    assert len(cache) == 0
+
+
+def test_zero_ttl_never_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(answer_cache.time, "time", lambda: now[0])
+    cache = AnswerCache(ttl_seconds=0)
+    cache.put("q", 5, "0", "answer")
+    
+    now[0] += 10 ** 9
+    assert cache.get("q", 5, "0") == "answer"
+
+
+def test_save_and_load_round_trip_keeps_lru_order(tmp_path):
+    path = tmp_path / "answers.json"
+    cache = AnswerCache(max_entries=3, path=path)
+    for question in ("a", "b", "c"):
+        cache.put(question, 5, "0", question.upper())
+    cache.get("a", 5, "0")
+    cache.save()
+    
+    loaded = AnswerCache(max_entries=3, path=path)
+    loaded.put("d", 5, "0", "D")
+    
+    assert len(loaded) == 3
+    assert loaded.get("b", 5, "0") is None
+    assert loaded.get("a", 5, "0") == "A"
+
+
+def test_unreadable_file_is_ignored(tmp_path):
+    path = tmp_path / "answers.json"
+    path.write_text("not json")
+    
+    assert len(AnswerCache(path=path)) == 0
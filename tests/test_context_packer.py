@@ -0,0 +1,80 @@
+"""
+Context assembly: merging adjacent chunks, overlap removal and the token budget.
+"""
+from src.agents.context_packer import merge_adjacent_chunks, pack_context
+
+
+def result(source, chunk_id, content, similarity):
+    return {
+        "content": content,
+        "metadata": {"source": source, "chunk_id": chunk_id},
+        "similarity": similarity,
+    }
+
+
+TEXT = "".join(f"Rule {i}: employees must follow policy number {i}. " for i in range(40))
+
+
+def test_adjacent_chunks_merge_back_into_the_original_text(processor):
+    chunks = processor.chunk_text(TEXT, 300, 60)
+    results = [result("handbook.pdf", i, content, 0.9 - i / 100) for i, content in enumerate(chunks[:3])]
+    
+    sections = merge_adjacent_chunks(results, chunk_overlap=60)
+    
+    assert len(sections) == 1
+    assert (sections[0]["first_chunk_id"], sections[0]["last_chunk_id"]) == (0, 2)
+    assert TEXT.startswith(sections[0]["content"])
+    assert sections[0]["similarity"] == 0.9
+
+
+def test_duplicates_are_dropped_and_gaps_split_sections(processor):
+    chunks = processor.chunk_text(TEXT, 300, 60)
+    results = [
+        result("handbook.pdf", 3, chunks[3], 0.9),
+        result("handbook.pdf", 0, chunks[0], 0.8),
+        result("handbook.pdf", 3, chunks[3], 0.7),
+        result("other.pdf", 0, "Unrelated text", 0.6),
+        {"content": "No metadata", "similarity": 0.5},
+    ]
+    
+    sections = merge_adjacent_chunks(results, chunk_overlap=60)
+    
+    # Relevance order of each section's best chunk
+    assert [(s["source"], s["first_chunk_id"]) for s in sections] == [
+        ("handbook.pdf", 3), ("handbook.pdf", 0), ("other.pdf", 0), ("Unknown", None)
+    ]
+    assert sections[0]["content"] == chunks[3]
+
+
+def test_pack_context_labels_merged_sections_once(processor):
+    chunks = processor.chunk_text(TEXT, 300, 60)
+    results = [result("handbook.pdf", i, content, 0.9) for i, content in enumerate(chunks[:2])]
+    
+    context = pack_context(results, token_budget=10000, chunk_overlap=60)
+    
+    assert context.count("[Document") == 1
+    assert "Source: handbook.pdf, chunks 0-1" in context
+    assert context.count("Rule 1:") == 1
+
+
+def test_pack_context_skips_sections_over_budget():
+    results = [
+        result("big.pdf", 0, "x" * 4000, 0.9),
+        result("small.pdf", 0, "Short answer.", 0.8),
+    ]
+    
+    context = pack_context(results, token_budget=100, chunk_overlap=0)
+    
+    # The most relevant section does not fit and is truncated to the budget
+    assert context.startswith("[Document 1 - Source: big.pdf")
+    assert len(context) <= 100 * 4 + 1
+    
+    context = pack_context(list(reversed(results)), token_budget=100, chunk_overlap=0)
+    assert "small.pdf" in context
+    assert "big.pdf" not in context
+
+
+def test_relevance_label_is_the_similarity():
+    context = pack_context([result("leave.pdf", 0, "Annual leave is 25 days.", 0.88)], 1000, 200)
+    
+    assert "(Relevance: 88.00%)" in context
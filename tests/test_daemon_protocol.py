@@ -0,0 +1,53 @@
+"""
+Daemon client: the timeout covers only the start of an answer.
+"""
+import asyncio
+import json
+
+import pytest
+
+from src.daemon.protocol import DaemonTimeout, DaemonUnavailable, ask_daemon
+
+
+async def ask_scripted_daemon(tmp_path, replies, timeout):
+    """Ask a daemon that sends `replies` ((delay, message) pairs) and then idles."""
+    async def handle(reader, writer):
+        await reader.readline()
+        for delay, message in replies:
+            await asyncio.sleep(delay)
+            writer.write((json.dumps(message) + "\n").encode())
+            await writer.drain()
+        await reader.read()
+        writer.close()
+    
+    path = tmp_path / "daemon.sock"
+    server = await asyncio.start_unix_server(handle, path=str(path))
+    try:
+        return await ask_daemon(path, "How many vacation days?", first_message_timeout=timeout)
+    finally:
+        server.close()
+
+
+def test_silent_daemon_times_out(tmp_path):
+    with pytest.raises(DaemonTimeout):
+        asyncio.run(ask_scripted_daemon(tmp_path, [(1.0, {"token": "late"})], timeout=0.1))
+
+
+def test_streaming_answer_is_not_cut_off(tmp_path):
+    replies = [(0, {"token": "25 "}), (0.3, {"token": "days"}), (0, {"done": True})]
+    
+    reply = asyncio.run(ask_scripted_daemon(tmp_path, replies, timeout=0.1))
+    
+    assert reply["answer"] == "25 days"
+
+
+def test_error_after_tokens_is_raised(tmp_path):
+    replies = [(0, {"token": "25 "}), (0, {"error": "model unavailable"})]
+    
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        asyncio.run(ask_scripted_daemon(tmp_path, replies, timeout=0.1))
+
+
+def test_missing_socket_is_unavailable(tmp_path):
+    with pytest.raises(DaemonUnavailable):
+        asyncio.run(ask_daemon(tmp_path / "missing.sock", "question", first_message_timeout=0.1))
@@ -0,0 +1,77 @@
+"""
+HRAssistantTeam end to end against the local vector store and a replayed model.
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("autogen_ext.models.replay")
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from src.agents.answer_cache import AnswerCache
+from src.agents.hr_agents import HRAssistantTeam
+from src.vector_db.vector_db.memory_vector_store import InMemoryVectorStore
+from tests.conftest import DIMENSIONS, fake_embedding
+
+
+class CountingReplayClient(ReplayChatCompletionClient):
+    """Replay client that counts model calls."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+    
+    async def create(self, *args, **kwargs):
+        self.calls += 1
+        return await super().create(*args, **kwargs)
+    
+    def create_stream(self, *args, **kwargs):
+        self.calls += 1
+        return super().create_stream(*args, **kwargs)
+
+
+def make_team(embedder, answers, answer_cache=None):
+    store = InMemoryVectorStore(embedding_dimensions=DIMENSIONS)
+    content = "Employees receive 25 vacation days per calendar year."
+    store.insert_documents([{
+        "content": content,
+        "contentVector": fake_embedding(content),
+        "metadata": {"source": "leave_policy.pdf", "chunk_id": 0},
+    }])
+    model_client = CountingReplayClient(answers)
+    team = HRAssistantTeam(
+        cosmos_db=store,
+        pdf_processor=embedder,
+        azure_endpoint="",
+        azure_deployment="replay",
+        api_key="",
+        api_version="",
+        answer_cache=answer_cache,
+        model_client=model_client
+    )
+    return team, model_client
+
+
+def test_ask_question_answers_from_context(embedder):
+    team, model_client = make_team(embedder, ["You get 25 vacation days."])
+    
+    answer = asyncio.run(team.ask_question("How many vacation days?", top_k=1))
+    
+    assert answer == "You get 25 vacation days."
+    assert model_client.calls == 1
+
+
+def test_repeated_question_is_answered_from_cache(embedder):
+    answer_cache = AnswerCache()
+    team, model_client = make_team(embedder, ["You get 25 vacation days."], answer_cache)
+    
+    async def ask_twice():
+        first = await team.ask_question("How many vacation days?")
+        second = await team.ask_question("how many vacation days")
+        return first, second
+    
+    first, second = asyncio.run(ask_twice())
+    
+    assert first == second == "You get 25 vacation days."
+    assert model_client.calls == 1
+    assert len(answer_cache) == 1
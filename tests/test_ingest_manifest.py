@@ -0,0 +1,72 @@
+"""
+Ingest manifest: change detection and stale chunk bookkeeping.
+"""
+from src.processors.ingest_manifest import IngestManifest
+
+
+SETTINGS = {"chunk_size": 1000, "chunk_overlap": 200, "embedding_model": "m", "embedding_dimensions": 16}
+
+
+def make_pdf(tmp_path, name="leave.pdf", content=b"%PDF leave policy"):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+def test_recorded_file_is_unchanged_after_reload(tmp_path):
+    pdf = make_pdf(tmp_path)
+    manifest = IngestManifest(tmp_path / "manifest.json", SETTINGS)
+    assert manifest.has_changed(pdf)
+    
+    manifest.record(pdf, ["doc_1", "doc_2"])
+    manifest.save()
+    
+    assert not IngestManifest(tmp_path / "manifest.json", SETTINGS).has_changed(pdf)
+
+
+def test_changed_settings_mark_every_file_changed(tmp_path):
+    pdf = make_pdf(tmp_path)
+    manifest = IngestManifest(tmp_path / "manifest.json", SETTINGS)
+    manifest.record(pdf, ["doc_1"])
+    manifest.save()
+    
+    for key, value in [("chunk_size", 500), ("chunk_overlap", 0), ("embedding_model", "other"), ("embedding_dimensions", 8)]:
+        reloaded = IngestManifest(tmp_path / "manifest.json", dict(SETTINGS, **{key: value}))
+        assert reloaded.has_changed(pdf), key
+
+
+def test_record_returns_chunks_no_longer_produced(tmp_path):
+    pdf = make_pdf(tmp_path)
+    manifest = IngestManifest(tmp_path / "manifest.json", SETTINGS)
+    manifest.record(pdf, ["doc_1", "doc_2"])
+    
+    assert manifest.record(pdf, ["doc_2", "doc_3"]) == ["doc_1"]
+
+
+def test_shared_chunks_survive_until_unreferenced(tmp_path):
+    first = make_pdf(tmp_path, "first.pdf")
+    second = make_pdf(tmp_path, "second.pdf", b"%PDF other")
+    manifest = IngestManifest(tmp_path / "manifest.json", SETTINGS)
+    manifest.record(first, ["doc_shared", "doc_first"])
+    manifest.record(second, ["doc_shared"])
+    
+    removed = manifest.remove_missing([second])
+    
+    assert sorted(removed) == ["doc_first", "doc_shared"]
+    assert manifest.unreferenced(removed) == ["doc_first"]
+
+
+def test_targets_are_tracked_separately(tmp_path):
+    pdf = make_pdf(tmp_path)
+    manifest = IngestManifest(tmp_path / "manifest.json", SETTINGS, target="cosmos:hr/documents")
+    manifest.record(pdf, ["doc_1"])
+    manifest.save()
+    
+    local = IngestManifest(tmp_path / "manifest.json", SETTINGS, target="memory:/data/vectors.npz")
+    assert local.has_changed(pdf)
+    local.record(pdf, ["doc_1"])
+    local.save()
+    
+    reloaded = IngestManifest(tmp_path / "manifest.json", SETTINGS, target="cosmos:hr/documents")
+    assert not reloaded.has_changed(pdf)
+    assert set(reloaded.targets) == {"cosmos:hr/documents", "memory:/data/vectors.npz"}
@@ -0,0 +1,104 @@
+"""
+Chunking and document building (no PDF parsing or Azure calls).
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from src.processors.pdf_processor import PDFProcessor, resolve_workers
+
+
+TEXT = "".join(f"Sentence {i} of the employee handbook. " for i in range(200))
+
+
+def reference_chunks(text, chunk_size, overlap):
+    """The original whole-text chunker that iter_chunks must reproduce."""
+    chunks = []
+    for start in range(0, len(text), chunk_size - overlap):
+        chunk = text[start:start + chunk_size].strip()
+        if chunk:
+            chunks.append(chunk)
+    return chunks
+
+
+@pytest.mark.parametrize("page_size", [1, 37, 500, 1000, 1001, len(TEXT)])
+@pytest.mark.parametrize("chunk_size,overlap", [(1000, 200), (100, 0), (50, 49)])
+def test_iter_chunks_matches_chunk_text(processor, page_size, chunk_size, overlap):
+    pages = [TEXT[i:i + page_size] for i in range(0, len(TEXT), page_size)]
+    
+    streamed = list(processor.iter_chunks(pages, chunk_size, overlap))
+    
+    assert streamed == reference_chunks(TEXT, chunk_size, overlap)
+    assert processor.chunk_text(TEXT, chunk_size, overlap) == streamed
+
+
+def test_iter_chunks_skips_blank_chunks(processor):
+    pages = ["   \n", "Leave policy" + " " * 30, "\n\n"]
+    
+    assert list(processor.iter_chunks(pages, 10, 2)) == reference_chunks("".join(pages), 10, 2)
+
+
+def test_iter_chunks_handles_multi_megabyte_page(processor):
+    # One huge page must not be re-copied for every chunk (quadratic time)
+    page = TEXT * 600
+    assert len(page) > 4_000_000
+    
+    streamed = list(processor.iter_chunks([page, "tail"], 1000, 200))
+    
+    assert streamed == reference_chunks(page + "tail", 1000, 200)
+
+
+def test_iter_chunks_rejects_overlap_not_smaller_than_chunk(processor):
+    with pytest.raises(ValueError):
+        list(processor.iter_chunks(["text"], 10, 10))
+
+
+def test_build_documents_drops_chunks_without_embedding(processor):
+    documents = processor.build_documents(
+        "/data/leave.pdf", ["first", "second", "third"], [[0.1], [], [0.3]]
+    )
+    
+    assert [doc["content"] for doc in documents] == ["first", "third"]
+    assert [doc["metadata"]["chunk_id"] for doc in documents] == [0, 2]
+    assert all(doc["metadata"]["source"] == "leave.pdf" for doc in documents)
+
+
+class RecordingEmbeddings:
+    """Stand-in for `client.embeddings` that records the request options."""
+    
+    def __init__(self):
+        self.requests = []
+    
+    def create(self, input, **options):
+        self.requests.append(options)
+        texts = input if isinstance(input, list) else [input]
+        data = [SimpleNamespace(index=i, embedding=[0.5, 0.5]) for i in range(len(texts))]
+        return SimpleNamespace(data=data, usage=SimpleNamespace(total_tokens=len(texts)))
+
+
+@pytest.mark.parametrize("dimensions,expected", [(None, {}), (384, {"dimensions": 384})])
+def test_embedding_requests_pass_dimensions_only_when_set(dimensions, expected):
+    processor = PDFProcessor(
+        azure_endpoint="https://example.invalid",
+        azure_api_key="test",
+        api_version="2024-02-01",
+        embedding_model="test-embedding",
+        embedding_dimensions=dimensions
+    )
+    processor.client = SimpleNamespace(embeddings=RecordingEmbeddings())
+    
+    processor.generate_embedding("leave policy")
+    processor.generate_embeddings(["first", "second"])
+    
+    assert processor.client.embeddings.requests == [
+        dict(model="test-embedding", **expected),
+        dict(model="test-embedding", **expected),
+    ]
+
+
+def test_resolve_workers_treats_zero_as_one_per_core(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 6)
+    
+    assert resolve_workers(0) == 6
+    assert resolve_workers(-1) == 6
+    assert resolve_workers(2) == 2
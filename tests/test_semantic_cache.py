@@ -0,0 +1,67 @@
+"""
+Nearest-question answer cache.
+"""
+import numpy as np
+
+from src.agents.semantic_cache import SemanticAnswerCache
+
+
+def unit(*values):
+    vector = np.asarray(values, dtype=np.float64)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def test_near_identical_question_hits():
+    cache = SemanticAnswerCache(dimensions=3, threshold=0.95)
+    cache.put(unit(1, 0, 0), 5, "0", "answer")
+    
+    answer, similarity = cache.get(unit(1, 0.1, 0), 5, "0")
+    
+    assert answer == "answer"
+    assert similarity > 0.99
+
+
+def test_dissimilar_question_or_other_top_k_misses():
+    cache = SemanticAnswerCache(dimensions=3, threshold=0.95)
+    cache.put(unit(1, 0, 0), 5, "0", "answer")
+    
+    assert cache.get(unit(1, 1, 0), 5, "0") is None
+    assert cache.get(unit(1, 0, 0), 3, "0") is None
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_best_match_wins():
+    cache = SemanticAnswerCache(dimensions=3, threshold=0.9)
+    cache.put(unit(1, 0.3, 0), 5, "0", "close")
+    cache.put(unit(1, 0.05, 0), 5, "0", "closest")
+    
+    assert cache.get(unit(1, 0, 0), 5, "0")[0] == "closest"
+
+
+def test_new_generation_clears_entries():
+    cache = SemanticAnswerCache(dimensions=3)
+    cache.put(unit(1, 0, 0), 5, "0", "stale")
+    
+    assert cache.get(unit(1, 0, 0), 5, "1") is None
+    assert len(cache) == 0
+
+
+def test_invalid_embeddings_are_ignored():
+    cache = SemanticAnswerCache(dimensions=3)
+    cache.put([0.0, 0.0, 0.0], 5, "0", "zero")
+    cache.put([1.0, 0.0], 5, "0", "short")
+    
+    assert len(cache) == 0
+    assert cache.get([1.0, 0.0], 5, "0") is None
+
+
+def test_oldest_entries_are_overwritten_when_full():
+    cache = SemanticAnswerCache(dimensions=3, max_entries=2, threshold=0.99)
+    cache.put(unit(1, 0, 0), 5, "0", "first")
+    cache.put(unit(0, 1, 0), 5, "0", "second")
+    cache.put(unit(0, 0, 1), 5, "0", "third")
+    
+    assert len(cache) == 2
+    assert cache.get(unit(1, 0, 0), 5, "0") is None
+    assert cache.get(unit(0, 1, 0), 5, "0")[0] == "second"
+    assert cache.get(unit(0, 0, 1), 5, "0")[0] == "third"
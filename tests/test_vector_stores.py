@@ -0,0 +1,182 @@
+"""
+Local vector stores: insert, search, delete and save/load round trips.
+"""
+import numpy as np
+import pytest
+
+from src.vector_db.vector_db.hnsw_vector_store import HNSWVectorStore
+from src.vector_db.vector_db.memory_vector_store import InMemoryVectorStore
+from src.vector_db.vector_db.vector_store import VectorStore
+
+
+DIMENSIONS = 8
+
+
+def make_store(kind, path=None):
+    if kind == "hnsw":
+        return HNSWVectorStore(DIMENSIONS, path=path, m=4, ef_construction=32, ef_search=32, seed=0)
+    return InMemoryVectorStore(DIMENSIONS, path=path)
+
+
+def make_documents(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "content": f"chunk {i}",
+            "contentVector": rng.normal(size=DIMENSIONS).tolist(),
+            "metadata": {"source": "handbook.pdf", "chunk_id": i},
+        }
+        for i in range(count)
+    ]
+
+
+def ids(results):
+    return [doc["_id"] for doc in results]
+
+
+@pytest.fixture(params=["memory", "hnsw"])
+def kind(request):
+    return request.param
+
+
+def test_implements_vector_store(kind):
+    assert isinstance(make_store(kind), VectorStore)
+
+
+def test_insert_and_search(kind):
+    store = make_store(kind)
+    documents = make_documents(50)
+    
+    assert store.insert_documents(documents) == 50
+    assert store.count() == 50
+    
+    results = store.search(documents[7]["contentVector"], top_k=3)
+    assert len(results) == 3
+    assert results[0]["_id"] == documents[7]["_id"]
+    assert results[0]["content"] == "chunk 7"
+    assert results[0]["metadata"]["chunk_id"] == 7
+    assert results[0]["similarity"] == pytest.approx(1.0, abs=1e-5)
+    assert [r["similarity"] for r in results] == sorted((r["similarity"] for r in results), reverse=True)
+
+
+def test_similarity_threshold_filters_results(kind):
+    store = make_store(kind)
+    documents = make_documents(20)
+    store.insert_documents(documents)
+    
+    results = store.search(documents[0]["contentVector"], top_k=10, similarity_threshold=0.999)
+    
+    assert ids(results) == [documents[0]["_id"]]
+
+
+def test_invalid_vectors_are_reported_not_stored(kind):
+    store = make_store(kind)
+    documents = make_documents(2) + [
+        {"content": "empty", "contentVector": []},
+        {"content": "short", "contentVector": [1.0, 2.0]},
+        {"content": "missing"},
+    ]
+    
+    assert store.insert_documents(documents) == 2
+    assert len(store.last_write_errors) == 3
+    assert store.count() == 2
+
+
+def test_upsert_replaces_by_id(kind):
+    store = make_store(kind)
+    documents = make_documents(10)
+    store.insert_documents(documents)
+    
+    moved = dict(documents[3], contentVector=documents[5]["contentVector"], metadata={"chunk_id": -1})
+    store.insert_documents([moved])
+    
+    assert store.count() == 10
+    results = store.search(documents[5]["contentVector"], top_k=2)
+    assert set(ids(results)) == {documents[3]["_id"], documents[5]["_id"]}
+    assert store.search(documents[3]["contentVector"], top_k=1)[0]["_id"] != documents[3]["_id"]
+
+
+def test_delete_documents(kind):
+    store = make_store(kind)
+    documents = make_documents(30)
+    store.insert_documents(documents)
+    deleted = [doc["_id"] for doc in documents[:10]]
+    
+    assert store.delete_documents(deleted + ["doc_missing"]) == 10
+    assert store.delete_document(documents[10]["_id"]) is True
+    assert store.delete_document(documents[10]["_id"]) is False
+    assert store.count() == 19
+    
+    for doc in documents[:11]:
+        assert doc["_id"] not in ids(store.search(doc["contentVector"], top_k=19))
+    assert len(store.search(documents[20]["contentVector"], top_k=100)) == 19
+
+
+def test_save_and_load_round_trip(kind, tmp_path):
+    path = tmp_path / "vectors.bin"
+    store = make_store(kind, path)
+    documents = make_documents(40)
+    store.insert_documents(documents)
+    store.delete_documents([documents[0]["_id"]])
+    store.bump_generation()
+    store.close()
+    
+    loaded = make_store(kind, path)
+    
+    assert loaded.count() == 39
+    assert loaded.get_generation() == "1"
+    for doc in documents[1:6]:
+        query = doc["contentVector"]
+        assert ids(loaded.search(query, top_k=5)) == ids(store.search(query, top_k=5))
+    assert documents[0]["_id"] not in ids(loaded.search(documents[0]["contentVector"], top_k=39))
+
+
+def test_close_without_changes_writes_nothing(kind, tmp_path):
+    path = tmp_path / "vectors.bin"
+    make_store(kind, path).close()
+    
+    assert not path.exists()
+
+
+def test_wrong_dimensions_on_load_are_rejected(kind, tmp_path):
+    path = tmp_path / "vectors.bin"
+    store = make_store(kind, path)
+    store.insert_documents(make_documents(3))
+    store.save()
+    
+    with pytest.raises(ValueError):
+        (HNSWVectorStore if kind == "hnsw" else InMemoryVectorStore)(DIMENSIONS * 2, path=path)
+
+
+def test_hnsw_recall_against_exact_search():
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(20, 32))
+    vectors = centers[rng.integers(0, 20, 2000)] + 0.5 * rng.normal(size=(2000, 32))
+    documents = [
+        {"content": f"chunk {i}", "contentVector": vector.tolist(), "metadata": {}}
+        for i, vector in enumerate(vectors)
+    ]
+    exact = InMemoryVectorStore(32)
+    hnsw = HNSWVectorStore(32, m=8, ef_construction=64, ef_search=64, seed=0)
+    exact.insert_documents([dict(doc) for doc in documents])
+    hnsw.insert_documents([dict(doc) for doc in documents])
+    
+    queries = centers[rng.integers(0, 20, 50)] + 0.5 * rng.normal(size=(50, 32))
+    found = sum(
+        len(set(ids(hnsw.search(query, top_k=10))) & set(ids(exact.search(query, top_k=10))))
+        for query in queries
+    )
+    
+    assert found / (50 * 10) >= 0.95
+
+
+def test_hnsw_rebuilds_after_most_documents_are_deleted():
+    store = make_store("hnsw")
+    documents = make_documents(40)
+    store.insert_documents(documents)
+    
+    store.delete_documents([doc["_id"] for doc in documents[:25]])
+    
+    assert store.count() == 15
+    assert len(store._ids) == 15
+    assert ids(store.search(documents[30]["contentVector"], top_k=1)) == [documents[30]["_id"]]